@@ -0,0 +1,75 @@
+"""Frame helpers shared by the Streamlit apps (main.py and hero_data_analysis.py)
+
+numpy and pandas are imported inside the functions so importing this module
+does not load them before the first frame is built.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Pot types in logical order for the results filter
+POT_TYPE_ORDER = ['Preflop Only', 'Limped Pot', 'SRP', '3-Bet Pot', '4-Bet Pot', '5+ Bet Pot']
+
+# Rate name -> per-hand flag column averaged in the position and stakes tables
+POSITION_RATE_COLUMNS = {
+    'Showdown_Rate': 'Went_to_Showdown',
+    'Flop_Win_Rate': 'Won_When_Saw_Flop',
+    'Preflop_Raise_Rate': 'Preflop_Raised',
+    'CBet_Rate': 'CBet_Flop'
+}
+STAKES_RATE_COLUMNS = {
+    'Showdown_Rate': 'Went_to_Showdown',
+    'Flop_Win_Rate': 'Won_When_Saw_Flop'
+}
+
+def content_digest(data: bytes) -> bytes:
+    """Short digest of an uploaded file's contents"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def source_key(*parts) -> str:
+    """Cache key for a loaded frame, derived from what it was loaded from
+    
+    parts describe the source (a folder signature, or upload names and content
+    digests), so reloading unchanged files gives the same key and any edit a new one.
+    """
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+def compact_dtypes(df: pd.DataFrame, category_columns, bool_columns, money_columns) -> pd.DataFrame:
+    """Shrink a loaded frame in place: categorical strings, NumPy bool flags, float32 money"""
+    if df.empty:
+        return df
+    for col in category_columns:
+        df[col] = df[col].astype('category')
+    # Ordered pot types keep only the levels present, so .cat.categories is the filter list
+    df['Pot_Type'] = df['Pot_Type'].cat.set_categories(POT_TYPE_ORDER, ordered=True).cat.remove_unused_categories()
+    # Missing flags count as False; a nullable bool column cannot be cast to NumPy bool directly
+    df[bool_columns] = df[bool_columns].fillna(False).astype(bool)
+    df[money_columns] = df[money_columns].astype('float32')
+    df['Timestamp'] = df['Timestamp'].astype('datetime64[ns]')
+    return df
+
+def equals_mask(col: pd.Series, value):
+    """Boolean array of rows equal to value, comparing integer codes for categoricals"""
+    import numpy as np
+    import pandas as pd
+    
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        if value not in col.cat.categories:
+            return np.zeros(len(col), dtype=bool)
+        return col.cat.codes.to_numpy() == col.cat.categories.get_loc(value)
+    return (col == value).to_numpy(dtype=bool)
+
+def chart_indices(n: int, max_points: int):
+    """Evenly strided row positions for plotting at most about max_points, always keeping the final hand"""
+    import numpy as np
+    
+    step = max(1, -(-n // max_points))
+    idx = np.arange(0, n, step)
+    if idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)
+    return idx
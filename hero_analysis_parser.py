@@ -1,16 +1,116 @@
+from __future__ import annotations
+
 import os
-import glob
 import re
-import pandas as pd
+import mmap
 import logging
-from typing import Tuple, List, Optional, Dict, Any
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Tuple, List, Optional, Dict, Any
 from dataclasses import dataclass, field
+from operator import attrgetter
 from datetime import datetime
 
+# pandas is imported where a frame is built, so importing this module stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# DataFrame column name -> HeroData attribute, in output order
+HAND_COLUMNS = [
+    ('Hand_ID', 'hand_id'),
+    ('Timestamp', 'timestamp'),
+    ('Site', 'site'),
+    ('Stakes', 'stakes'),
+    ('Table_Name', 'table_name'),
+    ('Position', 'position'),
+    ('Hole_Cards', 'hole_cards'),
+    ('Went_to_Showdown', 'went_to_showdown'),
+    ('Won_at_Showdown', 'won_at_showdown'),
+    ('Won_When_Saw_Flop', 'won_when_saw_flop'),
+    ('Saw_Flop', 'saw_flop'),
+    ('Total_Contributed', 'total_contributed'),
+    ('Total_Collected', 'total_collected'),
+    ('Net_Profit', 'net_profit'),
+    ('Rake_Amount', 'rake_amount'),
+    ('Net_Profit_Before_Rake', 'net_profit_before_rake'),
+    ('Total_Pot_Size', 'total_pot_size'),
+    ('Preflop_Actions', 'preflop_actions'),
+    ('Flop_Actions', 'flop_actions'),
+    ('Turn_Actions', 'turn_actions'),
+    ('River_Actions', 'river_actions'),
+    ('Flop_Cards', 'flop_cards'),
+    ('Turn_Card', 'turn_card'),
+    ('River_Card', 'river_card'),
+    ('Preflop_Raised', 'preflop_raised'),
+    ('Preflop_Called', 'preflop_called'),
+    ('VPIP', 'vpip'),
+    ('Three_Bet', 'three_bet'),
+    ('Four_Bet', 'four_bet'),
+    ('Three_Bet_Opportunity', 'three_bet_opportunity'),
+    ('Four_Bet_Opportunity', 'four_bet_opportunity'),
+    ('Pot_Type', 'pot_type'),
+    ('CBet_Flop', 'cbet_flop'),
+    ('CBet_Turn', 'cbet_turn'),
+    ('CBet_River', 'cbet_river'),
+    ('CBet_Flop_Opportunity', 'cbet_flop_opportunity'),
+    ('CBet_Turn_Opportunity', 'cbet_turn_opportunity'),
+    ('CBet_River_Opportunity', 'cbet_river_opportunity'),
+    ('Raw_Text', 'raw_text')
+]
+
+# List attributes stored as space-joined strings
+JOINED_COLUMNS = {'Hole_Cards', 'Flop_Cards'}
+
+def find_txt_files(root: str) -> List[str]:
+    """Recursively collect .txt files under root using os.scandir
+    
+    Matches the recursive glob it replaced: hidden names are skipped, symlinked
+    directories are followed (each real directory once) and unreadable
+    directories are passed over.
+    """
+    out = []
+    stack = [root]
+    seen = set()
+    while stack:
+        d = stack.pop()
+        real = os.path.realpath(d)
+        if real in seen:
+            continue
+        seen.add(real)
+        try:
+            with os.scandir(d) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                stack.append(entry.path)
+            elif entry.name.endswith('.txt'):
+                out.append(entry.path)
+    return out
+
+def folder_signature(folder_path: str) -> Tuple[Tuple[str, int, int], ...]:
+    """Path, mtime and size of every .txt file so edits invalidate a cached load"""
+    signature = []
+    for path in find_txt_files(folder_path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
 @dataclass
 class HeroData:
     """Streamlined Hero-specific data for analysis"""
@@ -982,12 +1082,50 @@ class HeroAnalysisParser:
         except Exception as e:
             logger.error(f"Error parsing file: {e}")
             return []
-    
-    def process_files(self, folder_path: str) -> pd.DataFrame:
-        """Process all hand history files and return a DataFrame"""
+
+    def parse_file_spans(self, data: bytes) -> Tuple[List[HeroData], List[int], List[int]]:
+        """Parse a file's raw bytes, also returning the byte span of each hand's text"""
+        # Split at the same 'Poker Hand #' boundaries as parse_file, but on bytes so offsets index the file
+        bounds = [0] + [m.start() for m in re.finditer(rb'Poker Hand #', data)] + [len(data)]
+        hands, starts, ends = [], [], []
+        for start, end in zip(bounds, bounds[1:]):
+            chunk = data[start:end]
+            hand = _normalize_newlines(chunk.decode('utf-8'))
+            if not hand.strip():
+                continue
+            result = self.parse_hand(hand)
+            if result is not None:
+                hands.append(result)
+                starts.append(start + len(chunk) - len(chunk.lstrip()))
+                ends.append(end - len(chunk) + len(chunk.rstrip()))
+        return hands, starts, ends
+
+    def hands_to_dataframe(self, hands: List[HeroData]) -> pd.DataFrame:
+        """Convert parsed hands to a pyarrow-backed DataFrame"""
+        import pandas as pd
+        
+        # Build column-wise lists; a dict of lists is the fast DataFrame constructor path
+        columns = {}
+        for name, attr in HAND_COLUMNS:
+            values = list(map(attrgetter(attr), hands))
+            if name in JOINED_COLUMNS:
+                values = [' '.join(v) for v in values]
+            columns[name] = values
+        
+        return pd.DataFrame(columns).convert_dtypes(dtype_backend='pyarrow')
+
+    def process_files(self, folder_path: str, max_workers: Optional[int] = None,
+                      raw_spans: bool = False) -> pd.DataFrame:
+        """Process all hand history files and return a DataFrame
+        
+        max_workers sets the number of parser processes (None uses every CPU,
+        1 parses serially in this process). With raw_spans, each hand's text is
+        replaced by Raw_Path/Raw_Start/Raw_End columns for read_raw_spans.
+        """
+        import pandas as pd
+        
         try:
-            file_pattern = os.path.join(folder_path, '**', '*.txt')
-            all_files = glob.glob(file_pattern, recursive=True)
+            all_files = find_txt_files(folder_path)
             
             if not all_files:
                 logger.warning(f"No .txt files found in {folder_path}")
@@ -995,71 +1133,25 @@ class HeroAnalysisParser:
             
             logger.info(f"Found {len(all_files)} files to process")
             
-            all_hands = []
-            
-            for filepath in all_files:
-                try:
-                    logger.info(f"Processing file: {os.path.basename(filepath)}")
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                    
-                    hands = self.parse_file(text)
-                    all_hands.extend(hands)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing file {filepath}: {e}")
-                    continue
+            # Files are independent, so parse them across worker processes
+            parse = partial(parse_one_file, raw_spans=raw_spans)
+            if max_workers == 1 or len(all_files) == 1:
+                results = list(map(parse, all_files))
+            else:
+                # Spawned workers, since forking a multi-threaded server process is unsafe;
+                # about four chunks per worker keeps every process busy on small folders
+                workers = max_workers or os.cpu_count() or 1
+                chunksize = max(1, len(all_files) // (workers * 4))
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+                    results = list(executor.map(parse, all_files, chunksize=chunksize))
+            frames = [frame for frame in results if frame is not None]
             
-            if not all_hands:
+            if not frames:
                 logger.warning("No hands processed")
                 return pd.DataFrame()
             
-            # Convert to DataFrame
-            data = []
-            for hand in all_hands:
-                data.append({
-                    'Hand_ID': hand.hand_id,
-                    'Timestamp': hand.timestamp,
-                    'Site': hand.site,
-                    'Stakes': hand.stakes,
-                    'Table_Name': hand.table_name,
-                    'Position': hand.position,
-                    'Hole_Cards': ' '.join(hand.hole_cards),
-                    'Went_to_Showdown': hand.went_to_showdown,
-                    'Won_at_Showdown': hand.won_at_showdown,
-                    'Won_When_Saw_Flop': hand.won_when_saw_flop,
-                    'Saw_Flop': hand.saw_flop,
-                    'Total_Contributed': hand.total_contributed,
-                    'Total_Collected': hand.total_collected,
-                    'Net_Profit': hand.net_profit,
-                    'Rake_Amount': hand.rake_amount,
-                    'Net_Profit_Before_Rake': hand.net_profit_before_rake,
-                    'Total_Pot_Size': hand.total_pot_size,
-                    'Preflop_Actions': hand.preflop_actions,
-                    'Flop_Actions': hand.flop_actions,
-                    'Turn_Actions': hand.turn_actions,
-                    'River_Actions': hand.river_actions,
-                    'Flop_Cards': ' '.join(hand.flop_cards),
-                    'Turn_Card': hand.turn_card,
-                    'River_Card': hand.river_card,
-                    'Preflop_Raised': hand.preflop_raised,
-                    'Preflop_Called': hand.preflop_called,
-                    'VPIP': hand.vpip,
-                    'Three_Bet': hand.three_bet,
-                    'Four_Bet': hand.four_bet,
-                    'Three_Bet_Opportunity': hand.three_bet_opportunity,
-                    'Four_Bet_Opportunity': hand.four_bet_opportunity,
-                    'Pot_Type': hand.pot_type,
-                    'CBet_Flop': hand.cbet_flop,
-                    'CBet_Turn': hand.cbet_turn,
-                    'CBet_River': hand.cbet_river,
-                    'CBet_Flop_Opportunity': hand.cbet_flop_opportunity,
-                    'CBet_Turn_Opportunity': hand.cbet_turn_opportunity,
-                    'CBet_River_Opportunity': hand.cbet_river_opportunity,
-                    'Raw_Text': hand.raw_text
-                })
-            
-            df = pd.DataFrame(data)
+            # Arrow-backed columns concatenate as chunk appends rather than copies
+            df = pd.concat(frames, ignore_index=True)
             df = df.sort_values('Timestamp')
             
             # Add running totals
@@ -1075,6 +1167,63 @@ class HeroAnalysisParser:
             logger.error(f"Error in process_files: {e}")
             return pd.DataFrame()
 
+def _normalize_newlines(text: str) -> str:
+    """Translate CRLF and lone CR line endings to LF, as text-mode open() does"""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def _iter_span_bytes(paths, starts, ends):
+    """Newline-normalized bytes of each span, mapping each source file once"""
+    maps = {}
+    try:
+        for path, start, end in zip(paths, starts, ends):
+            if path not in maps:
+                with open(path, 'rb') as f:
+                    maps[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            yield maps[path][start:end].replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    finally:
+        for mapped in maps.values():
+            mapped.close()
+
+def read_raw_spans(paths, starts, ends) -> List[str]:
+    """Hand texts for parallel path/start/end sequences"""
+    return [data.decode('utf-8').strip() for data in _iter_span_bytes(paths, starts, ends)]
+
+def join_raw_spans(paths, starts, ends, sep: bytes = b'\n\n') -> bytes:
+    """UTF-8 export of the span texts joined by sep, built from bytes without decoding each hand"""
+    return sep.join(_iter_span_bytes(paths, starts, ends))
+
+def parse_one_upload(data: bytes) -> Optional[pd.DataFrame]:
+    """Parse one uploaded file's bytes; module-level so process pools can pickle it"""
+    parser = HeroAnalysisParser()
+    hands = parser.parse_file(data.decode('utf-8', 'ignore'))
+    return parser.hands_to_dataframe(hands) if hands else None
+
+def parse_one_file(filepath: str, raw_spans: bool = False) -> Optional[pd.DataFrame]:
+    """Parse a single hand history file; module-level so process pools can pickle it"""
+    try:
+        logger.info(f"Processing file: {os.path.basename(filepath)}")
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        
+        parser = HeroAnalysisParser()
+        if not raw_spans:
+            hands = parser.parse_file(_normalize_newlines(data.decode('utf-8')))
+            return parser.hands_to_dataframe(hands) if hands else None
+        
+        # Keep only where each hand lives in the file; the text is read back on demand
+        hands, starts, ends = parser.parse_file_spans(data)
+        if not hands:
+            return None
+        df = parser.hands_to_dataframe(hands).drop(columns='Raw_Text')
+        df['Raw_Path'] = filepath
+        df['Raw_Start'] = starts
+        df['Raw_End'] = ends
+        return df
+    
+    except Exception as e:
+        logger.error(f"Error processing file {filepath}: {e}")
+        return None
+
 def main():
     """Main function for testing the parser"""
     parser = HeroAnalysisParser()
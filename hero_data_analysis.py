@@ -1,13 +1,35 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import importlib.util
+import sys
 import os
-import glob
 import re
-from hero_analysis_parser import HeroAnalysisParser
 from datetime import datetime, timedelta
+from collections.abc import Mapping
+from functools import cached_property
+
+def _lazy_import(name):
+    """Return a module that is only loaded on first attribute access"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# Defer heavy imports so the welcome screen renders before they load
+np = _lazy_import('numpy')
+pd = _lazy_import('pandas')
+px = _lazy_import('plotly.express')
+go = _lazy_import('plotly.graph_objects')
+
+from hero_analysis_parser import HeroAnalysisParser, find_txt_files, folder_signature
+from hero_analysis_helpers import (
+    compact_dtypes, content_digest, equals_mask, chart_indices, source_key,
+    POT_TYPE_ORDER, POSITION_RATE_COLUMNS, STAKES_RATE_COLUMNS
+)
 
 # Page configuration
 st.set_page_config(
@@ -165,26 +187,405 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Boolean per-hand flags that the key metrics count
+FLAG_COLUMNS = [
+    'VPIP', 'Saw_Flop', 'Won_When_Saw_Flop', 'Went_to_Showdown', 'Won_at_Showdown',
+    'Preflop_Raised', 'Preflop_Called', 'Three_Bet', 'Three_Bet_Opportunity',
+    'Four_Bet', 'Four_Bet_Opportunity', 'CBet_Flop', 'CBet_Turn', 'CBet_River',
+    'CBet_Flop_Opportunity', 'CBet_Turn_Opportunity', 'CBet_River_Opportunity'
+]
+
+# Columns shown in the detailed hand table
+DETAIL_COLUMNS = [
+    'Hand_ID', 'Timestamp', 'Position', 'Stakes', 'Hole_Cards',
+    'Net_Profit', 'Went_to_Showdown', 'Won_When_Saw_Flop',
+    'Preflop_Raised', 'CBet_Flop'
+]
+
+# Points per line above which the results chart is downsampled
+MAX_CHART_POINTS = 20_000
+
+# Low-cardinality columns used as filters and group keys
+CATEGORY_COLUMNS = ['Position', 'Stakes', 'Pot_Type']
+
+# Per-hand amounts; display precision is cents, so float32 is plenty
+MONEY_COLUMNS = ['Net_Profit', 'Net_Profit_Before_Rake', 'Rake_Amount', 'Total_Pot_Size']
+
+# Keys of KeyMetrics served by the money aggregation; the rest come from the flag matrix
+MONEY_METRICS = {
+    'total_hands', 'total_profit', 'total_profit_before_rake', 'total_rake',
+    'avg_profit', 'avg_profit_before_rake', 'avg_rake', 'rake_percentage'
+}
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _money_metrics(_df, frame_key):
+    """Profit and rake metrics, cached per loaded DataFrame"""
+    total_hands = len(_df)
+    # Widen the float32 amounts back to exact cents before summing, then reduce all
+    # money columns in a single aggregation pass
+    money = _df[MONEY_COLUMNS].astype('float64').round(2).agg({
+        'Net_Profit': ['sum', 'mean'],
+        'Net_Profit_Before_Rake': ['sum', 'mean'],
+        'Rake_Amount': ['sum', 'mean'],
+        'Total_Pot_Size': ['sum']
+    })
+    total_profit = money.at['sum', 'Net_Profit']
+    total_profit_before_rake = money.at['sum', 'Net_Profit_Before_Rake']
+    total_rake = money.at['sum', 'Rake_Amount']
+    avg_profit = money.at['mean', 'Net_Profit']
+    avg_profit_before_rake = money.at['mean', 'Net_Profit_Before_Rake']
+    avg_rake = money.at['mean', 'Rake_Amount']
+    total_pot_size = money.at['sum', 'Total_Pot_Size']
+    rake_percentage = (total_rake / total_pot_size * 100) if total_pot_size > 0 else 0
+    
+    return {
+        'total_hands': total_hands,
+        'total_profit': total_profit,
+        'total_profit_before_rake': total_profit_before_rake,
+        'total_rake': total_rake,
+        'avg_profit': avg_profit,
+        'avg_profit_before_rake': avg_profit_before_rake,
+        'avg_rake': avg_rake,
+        'rake_percentage': rake_percentage
+    }
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _flag_metrics(_flag_matrix, frame_key):
+    """Frequency metrics from the packed flag matrix, cached per loaded DataFrame"""
+    total_hands = len(_flag_matrix)
+    
+    # Count every boolean flag in one pass over the packed (N, k) flag matrix
+    flag_counts = dict(zip(FLAG_COLUMNS, _flag_matrix.sum(axis=0)))
+    
+    # VPIP metrics (separate from PFR)
+    vpip_hands = flag_counts['VPIP']
+    vpip_rate = (vpip_hands / total_hands) * 100 if total_hands > 0 else 0
+    
+    # Flop metrics
+    saw_flop = flag_counts['Saw_Flop']
+    flop_rate = (saw_flop / total_hands) * 100 if total_hands > 0 else 0
+    
+    won_when_saw_flop = flag_counts['Won_When_Saw_Flop']
+    flop_win_rate = (won_when_saw_flop / saw_flop) * 100 if saw_flop > 0 else 0
+    
+    # Showdown metrics (only calculated on hands where Hero saw flop)
+    went_to_showdown = flag_counts['Went_to_Showdown']
+    showdown_rate = (went_to_showdown / saw_flop) * 100 if saw_flop > 0 else 0
+    
+    # Won at showdown (W$SD) - percentage of showdowns won
+    won_at_showdown = flag_counts['Won_at_Showdown']
+    won_at_showdown_rate = (won_at_showdown / went_to_showdown) * 100 if went_to_showdown > 0 else 0
+    
+    # Preflop metrics
+    preflop_raised = flag_counts['Preflop_Raised']
+    preflop_raise_rate = (preflop_raised / total_hands) * 100 if total_hands > 0 else 0
+    
+    preflop_called = flag_counts['Preflop_Called']
+    preflop_call_rate = (preflop_called / total_hands) * 100 if total_hands > 0 else 0
+    
+    # 3-bet metrics
+    three_bet = flag_counts['Three_Bet']
+    three_bet_opportunities = flag_counts['Three_Bet_Opportunity']
+    three_bet_rate = (three_bet / three_bet_opportunities * 100) if three_bet_opportunities > 0 else 0
+    
+    # 4-bet metrics
+    four_bet = flag_counts['Four_Bet']
+    four_bet_opportunities = flag_counts['Four_Bet_Opportunity']
+    four_bet_rate = (four_bet / four_bet_opportunities * 100) if four_bet_opportunities > 0 else 0
+    
+    # C-bet metrics
+    cbet_flop = flag_counts['CBet_Flop']
+    cbet_turn = flag_counts['CBet_Turn']
+    cbet_river = flag_counts['CBet_River']
+    
+    # C-bet opportunities
+    cbet_flop_opportunities = flag_counts['CBet_Flop_Opportunity']
+    cbet_turn_opportunities = flag_counts['CBet_Turn_Opportunity']
+    cbet_river_opportunities = flag_counts['CBet_River_Opportunity']
+    
+    # C-bet rates (as percentage of opportunities)
+    cbet_flop_rate = (cbet_flop / cbet_flop_opportunities * 100) if cbet_flop_opportunities > 0 else 0
+    cbet_turn_rate = (cbet_turn / cbet_turn_opportunities * 100) if cbet_turn_opportunities > 0 else 0
+    cbet_river_rate = (cbet_river / cbet_river_opportunities * 100) if cbet_river_opportunities > 0 else 0
+    
+    return {
+        'vpip_hands': vpip_hands,
+        'vpip_rate': vpip_rate,
+        'went_to_showdown': went_to_showdown,
+        'showdown_rate': showdown_rate,
+        'saw_flop': saw_flop,
+        'flop_rate': flop_rate,
+        'won_when_saw_flop': won_when_saw_flop,
+        'flop_win_rate': flop_win_rate,
+        'won_at_showdown': won_at_showdown,
+        'won_at_showdown_rate': won_at_showdown_rate,
+        'preflop_raised': preflop_raised,
+        'preflop_raise_rate': preflop_raise_rate,
+        'preflop_called': preflop_called,
+        'preflop_call_rate': preflop_call_rate,
+        'three_bet': three_bet,
+        'three_bet_opportunities': three_bet_opportunities,
+        'three_bet_rate': three_bet_rate,
+        'four_bet': four_bet,
+        'four_bet_opportunities': four_bet_opportunities,
+        'four_bet_rate': four_bet_rate,
+        'cbet_flop': cbet_flop,
+        'cbet_turn': cbet_turn,
+        'cbet_river': cbet_river,
+        'cbet_flop_opportunities': cbet_flop_opportunities,
+        'cbet_turn_opportunities': cbet_turn_opportunities,
+        'cbet_river_opportunities': cbet_river_opportunities,
+        'cbet_flop_rate': cbet_flop_rate,
+        'cbet_turn_rate': cbet_turn_rate,
+        'cbet_river_rate': cbet_river_rate
+    }
+
+class KeyMetrics(Mapping):
+    """Read-only mapping of key metrics that computes each group on first access
+    
+    Without a loaded frame the mapping is empty.
+    """
+    
+    def __init__(self, df=None, flag_matrix=None, frame_key=None):
+        self._df = df
+        self._flag_matrix = flag_matrix
+        self._loaded = df is not None and not df.empty
+        self._key = frame_key
+    
+    @cached_property
+    def _money(self):
+        return _money_metrics(self._df, self._key) if self._loaded else {}
+    
+    @cached_property
+    def _flags(self):
+        return _flag_metrics(self._flag_matrix, self._key) if self._loaded else {}
+    
+    def __getitem__(self, name):
+        if name in MONEY_METRICS:
+            return self._money[name]
+        return self._flags[name]
+    
+    def __iter__(self):
+        yield from self._money
+        yield from self._flags
+    
+    def __len__(self):
+        return len(self._money) + len(self._flags)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _position_stakes_stats(_df, frame_key):
+    """Sums and counts per (Position, Stakes) cell from a single groupby pass"""
+    flags = list(POSITION_RATE_COLUMNS.values())
+    # Named aggregation yields flat column names, no MultiIndex to flatten
+    aggs = {}
+    for col in ['Net_Profit'] + flags:
+        aggs[f'{col}_sum'] = (col, 'sum')
+        aggs[f'{col}_count'] = (col, 'count')
+    # Sum the float32 profits in float64 so the rounded totals stay exact to the cent
+    cells = _df[['Position', 'Stakes', 'Net_Profit'] + flags].astype({'Net_Profit': 'float64'})
+    return cells.groupby(['Position', 'Stakes'], observed=True).agg(**aggs)
+
+def _marginal_stats(cells, level, rate_columns):
+    """Collapse the (Position, Stakes) cells onto one key and derive averages and rates"""
+    totals = cells.groupby(level=level, observed=True).sum()
+    stats = pd.DataFrame({
+        'Hands': totals['Net_Profit_count'],
+        'Total_Profit': totals['Net_Profit_sum'],
+        'Avg_Profit': totals['Net_Profit_sum'] / totals['Net_Profit_count']
+    })
+    for name, col in rate_columns.items():
+        stats[name] = totals[f'{col}_sum'] / totals[f'{col}_count']
+    return stats.round(3)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _position_stats(_df, frame_key):
+    """Aggregate per-position statistics, cached per loaded DataFrame"""
+    return _marginal_stats(_position_stakes_stats(_df, frame_key), 'Position', POSITION_RATE_COLUMNS)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _stakes_stats(_df, frame_key):
+    """Aggregate per-stakes statistics, cached per loaded DataFrame"""
+    stakes_stats = _marginal_stats(_position_stakes_stats(_df, frame_key), 'Stakes', STAKES_RATE_COLUMNS)
+    stakes_stats = stakes_stats.reset_index()
+    
+    # Extract big blind value from stakes string (e.g., "$0.02/$0.05" -> 0.05), defaulting to 1.0
+    bb = stakes_stats['Stakes'].astype(str).str.extract(r'/\s*\$?([\d.]+)', expand=False)
+    stakes_stats['BB'] = pd.to_numeric(bb, errors='coerce').fillna(1.0)
+    stakes_stats['Profit_BB'] = stakes_stats['Total_Profit'] / stakes_stats['BB']
+    
+    # Bar labels, formatted once here instead of through plotly text templates
+    stakes_stats['_cash_label'] = stakes_stats['Total_Profit'].map('${:.2f}'.format)
+    stakes_stats['_bb_label'] = stakes_stats['Profit_BB'].map('{:.1f} BB'.format)
+    return stakes_stats
+
+def _split_cumsum(went, profit):
+    """Split profit into showdown/non-showdown/total columns and accumulate them in one pass
+    
+    Any hand that went to showdown (win or lose) counts as showdown,
+    everything else as non-showdown.
+    """
+    split = np.zeros((len(profit), 3))
+    split[went, 0] = profit[went]
+    split[~went, 1] = profit[~went]
+    split[:, 2] = profit
+    return split, np.cumsum(split, axis=0)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _showdown_series(_df, frame_key, position, stakes, pot_type):
+    """Running showdown/non-showdown profit arrays for one filter selection, or None if no hands match"""
+    mask = np.ones(len(_df), dtype=bool)
+    if position != 'All Positions':
+        mask &= equals_mask(_df['Position'], position)
+    if stakes != 'All Stakes':
+        mask &= equals_mask(_df['Stakes'], stakes)
+    if pot_type != 'All Pot Types':
+        mask &= equals_mask(_df['Pot_Type'], pot_type)
+    
+    if not mask.any():
+        return None
+    
+    went = _df['Went_to_Showdown'].to_numpy(dtype=bool)[mask]
+    profit = _df['Net_Profit'].to_numpy(dtype=float)[mask]
+    split, running = _split_cumsum(went, profit)
+    showdown_profit = split[:, 0]
+    non_showdown_profit = split[:, 1]
+    
+    return {
+        'hand_number': _df['Hand_Number'].to_numpy()[mask],
+        'running_showdown': running[:, 0],
+        'running_non_showdown': running[:, 1],
+        'running_total': running[:, 2],
+        'total_showdown': showdown_profit.sum(),
+        'total_non_showdown': non_showdown_profit.sum(),
+        'showdown_hands': int(np.count_nonzero(showdown_profit)),
+        'non_showdown_hands': int(np.count_nonzero(non_showdown_profit))
+    }
+
+def _compact_dtypes(df):
+    """Shrink a loaded frame in place with this app's column lists"""
+    return compact_dtypes(df, CATEGORY_COLUMNS, FLAG_COLUMNS, MONEY_COLUMNS)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_hand_histories(folder_path: str, signature, _max_workers=None):
+    """Parse a hand history folder once and share the read-only frame across reruns"""
+    df = HeroAnalysisParser().process_files(folder_path, max_workers=_max_workers)
+    if not df.empty:
+        _compact_dtypes(df)
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _export_csv(_df, frame_key):
+    """Encode the frame as CSV bytes, in the same format as DataFrame.to_csv"""
+    return _df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _build_showdown_fig(_df, frame_key, position, stakes, pot_type):
+    """Assemble the results chart for one filter selection so reruns reuse the figure"""
+    series = _showdown_series(_df, frame_key, position, stakes, pot_type)
+    
+    # Create the chart (WebGL traces, strided down on very long histories)
+    idx = chart_indices(len(series['hand_number']), MAX_CHART_POINTS)
+    fig = go.Figure()
+    
+    # Add non-showdown winnings (red line)
+    fig.add_trace(
+        go.Scattergl(
+            x=series['hand_number'][idx], 
+            y=series['running_non_showdown'][idx],
+            name='Non-Showdown Profit',
+            line=dict(color='red', width=2),
+            hovertemplate='Hand %{x}<br>Non-Showdown: $%{y:.2f}<extra></extra>'
+        )
+    )
+    
+    # Add showdown winnings (blue line)
+    fig.add_trace(
+        go.Scattergl(
+            x=series['hand_number'][idx], 
+            y=series['running_showdown'][idx],
+            name='Showdown Profit',
+            line=dict(color='blue', width=2),
+            hovertemplate='Hand %{x}<br>Showdown: $%{y:.2f}<extra></extra>'
+        )
+    )
+    
+    # Add cumulative profit (green line)
+    fig.add_trace(
+        go.Scattergl(
+            x=series['hand_number'][idx], 
+            y=series['running_total'][idx],
+            name='Total Profit',
+            line=dict(color='green', width=3),
+            hovertemplate='Hand %{x}<br>Total: $%{y:.2f}<extra></extra>'
+        )
+    )
+    
+    # Add zero line
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    
+    # Update layout with filter info in title
+    filter_parts = []
+    if position != 'All Positions':
+        filter_parts.append(position)
+    if stakes != 'All Stakes':
+        filter_parts.append(stakes)
+    if pot_type != 'All Pot Types':
+        filter_parts.append(pot_type)
+    
+    filter_text = f" - {' | '.join(filter_parts)}" if filter_parts else ""
+    fig.update_layout(
+        title=f"Showdown vs Non-Showdown Winnings{filter_text}",
+        xaxis_title="Hand Number",
+        yaxis_title="Cumulative Profit ($)",
+        height=500,
+        showlegend=True,
+        hovermode='x unified'
+    )
+    
+    return fig
+
 class HeroDataAnalyzer:
     def __init__(self):
         self.parser = HeroAnalysisParser()
         self.df = None
+        # Content-derived key of the loaded frame for the per-frame caches
+        self.frame_key = None
+        self._unique = {}
+        self._available_pot_types = ['All Pot Types']
+        self._flag_matrix = None
     
-    def load_data(self, folder_path: str):
+    def _finalize_frame(self):
+        """Cache the filter values, the pot types present and the packed flag matrix"""
+        self._flag_matrix = self.df[FLAG_COLUMNS].to_numpy(dtype=np.int8)
+        self._unique = {col: sorted(self.df[col].cat.categories.tolist()) for col in CATEGORY_COLUMNS}
+        pot_types_present = set(self._unique['Pot_Type'])
+        self._available_pot_types = ['All Pot Types'] + [pt for pt in POT_TYPE_ORDER if pt in pot_types_present]
+    
+    def load_data(self, folder_path: str, max_workers=None):
         """Load and process hand history data from folder"""
+        # The signature scan needs a readable directory; report a bad path as no data
+        if not os.path.isdir(folder_path):
+            return False
         with st.spinner("Loading and analyzing hand histories..."):
-            self.df = self.parser.process_files(folder_path)
+            signature = folder_signature(folder_path)
+            self.df = load_hand_histories(folder_path, signature, max_workers)
+            self.frame_key = source_key(folder_path, signature)
+            if not self.df.empty:
+                self._finalize_frame()
         return not self.df.empty
     
     def load_uploaded_files(self, uploaded_files):
         """Load and process hand history data from uploaded files"""
         with st.spinner(f"Processing {len(uploaded_files)} uploaded file(s)..."):
             all_hands = []
+            digests = []
             
             for uploaded_file in uploaded_files:
                 try:
                     # Read the file content
-                    text = uploaded_file.read().decode('utf-8')
+                    data = uploaded_file.read()
+                    digests.append((uploaded_file.name, content_digest(data)))
+                    text = data.decode('utf-8')
                     
                     # Parse the file
                     hands = self.parser.parse_file(text)
@@ -250,114 +651,15 @@ class HeroDataAnalyzer:
             self.df['Running_Profit_Before_Rake'] = self.df['Net_Profit_Before_Rake'].cumsum()
             self.df['Running_Rake'] = self.df['Rake_Amount'].cumsum()
             self.df['Hand_Number'] = range(1, len(self.df) + 1)
+            _compact_dtypes(self.df)
+            self.frame_key = source_key(tuple(digests))
+            self._finalize_frame()
             
             return True
     
     def calculate_key_metrics(self):
-        """Calculate key performance metrics"""
-        if self.df is None or self.df.empty:
-            return {}
-        
-        total_hands = len(self.df)
-        total_profit = self.df['Net_Profit'].sum()
-        total_profit_before_rake = self.df['Net_Profit_Before_Rake'].sum()
-        total_rake = self.df['Rake_Amount'].sum()
-        avg_profit = self.df['Net_Profit'].mean()
-        avg_profit_before_rake = self.df['Net_Profit_Before_Rake'].mean()
-        avg_rake = self.df['Rake_Amount'].mean()
-        total_pot_size = self.df['Total_Pot_Size'].sum()
-        rake_percentage = (total_rake / total_pot_size * 100) if total_pot_size > 0 else 0
-        
-        # VPIP metrics (separate from PFR)
-        vpip_hands = self.df['VPIP'].sum()
-        vpip_rate = (vpip_hands / total_hands) * 100 if total_hands > 0 else 0
-        
-        # Flop metrics
-        saw_flop = self.df['Saw_Flop'].sum()
-        flop_rate = (saw_flop / total_hands) * 100 if total_hands > 0 else 0
-        
-        won_when_saw_flop = self.df['Won_When_Saw_Flop'].sum()
-        flop_win_rate = (won_when_saw_flop / saw_flop) * 100 if saw_flop > 0 else 0
-        
-        # Showdown metrics (only calculated on hands where Hero saw flop)
-        went_to_showdown = self.df['Went_to_Showdown'].sum()
-        showdown_rate = (went_to_showdown / saw_flop) * 100 if saw_flop > 0 else 0
-        
-        # Won at showdown (W$SD) - percentage of showdowns won
-        won_at_showdown = self.df['Won_at_Showdown'].sum()
-        won_at_showdown_rate = (won_at_showdown / went_to_showdown) * 100 if went_to_showdown > 0 else 0
-        
-        # Preflop metrics
-        preflop_raised = self.df['Preflop_Raised'].sum()
-        preflop_raise_rate = (preflop_raised / total_hands) * 100 if total_hands > 0 else 0
-        
-        preflop_called = self.df['Preflop_Called'].sum()
-        preflop_call_rate = (preflop_called / total_hands) * 100 if total_hands > 0 else 0
-        
-        # 3-bet metrics
-        three_bet = self.df['Three_Bet'].sum()
-        three_bet_opportunities = self.df['Three_Bet_Opportunity'].sum()
-        three_bet_rate = (three_bet / three_bet_opportunities * 100) if three_bet_opportunities > 0 else 0
-        
-        # 4-bet metrics
-        four_bet = self.df['Four_Bet'].sum()
-        four_bet_opportunities = self.df['Four_Bet_Opportunity'].sum()
-        four_bet_rate = (four_bet / four_bet_opportunities * 100) if four_bet_opportunities > 0 else 0
-        
-        # C-bet metrics
-        cbet_flop = self.df['CBet_Flop'].sum()
-        cbet_turn = self.df['CBet_Turn'].sum()
-        cbet_river = self.df['CBet_River'].sum()
-        
-        # C-bet opportunities
-        cbet_flop_opportunities = self.df['CBet_Flop_Opportunity'].sum()
-        cbet_turn_opportunities = self.df['CBet_Turn_Opportunity'].sum()
-        cbet_river_opportunities = self.df['CBet_River_Opportunity'].sum()
-        
-        # C-bet rates (as percentage of opportunities)
-        cbet_flop_rate = (cbet_flop / cbet_flop_opportunities * 100) if cbet_flop_opportunities > 0 else 0
-        cbet_turn_rate = (cbet_turn / cbet_turn_opportunities * 100) if cbet_turn_opportunities > 0 else 0
-        cbet_river_rate = (cbet_river / cbet_river_opportunities * 100) if cbet_river_opportunities > 0 else 0
-        
-        return {
-            'total_hands': total_hands,
-            'total_profit': total_profit,
-            'total_profit_before_rake': total_profit_before_rake,
-            'total_rake': total_rake,
-            'avg_profit': avg_profit,
-            'avg_profit_before_rake': avg_profit_before_rake,
-            'avg_rake': avg_rake,
-            'rake_percentage': rake_percentage,
-            'vpip_hands': vpip_hands,
-            'vpip_rate': vpip_rate,
-            'went_to_showdown': went_to_showdown,
-            'showdown_rate': showdown_rate,
-            'saw_flop': saw_flop,
-            'flop_rate': flop_rate,
-            'won_when_saw_flop': won_when_saw_flop,
-            'flop_win_rate': flop_win_rate,
-            'won_at_showdown': won_at_showdown,
-            'won_at_showdown_rate': won_at_showdown_rate,
-            'preflop_raised': preflop_raised,
-            'preflop_raise_rate': preflop_raise_rate,
-            'preflop_called': preflop_called,
-            'preflop_call_rate': preflop_call_rate,
-            'three_bet': three_bet,
-            'three_bet_opportunities': three_bet_opportunities,
-            'three_bet_rate': three_bet_rate,
-            'four_bet': four_bet,
-            'four_bet_opportunities': four_bet_opportunities,
-            'four_bet_rate': four_bet_rate,
-            'cbet_flop': cbet_flop,
-            'cbet_turn': cbet_turn,
-            'cbet_river': cbet_river,
-            'cbet_flop_opportunities': cbet_flop_opportunities,
-            'cbet_turn_opportunities': cbet_turn_opportunities,
-            'cbet_river_opportunities': cbet_river_opportunities,
-            'cbet_flop_rate': cbet_flop_rate,
-            'cbet_turn_rate': cbet_turn_rate,
-            'cbet_river_rate': cbet_river_rate
-        }
+        """Return key performance metrics, computed lazily on first access"""
+        return KeyMetrics(self.df, self._flag_matrix, self.frame_key)
     
     def render_overview_metrics(self, metrics):
         """Render overview metrics organized by category"""
@@ -447,32 +749,19 @@ class HeroDataAnalyzer:
         # Filters
         col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
         with col1:
-            positions = ['All Positions'] + sorted(list(self.df['Position'].unique()))
+            positions = ['All Positions'] + self._unique['Position']
             selected_position = st.selectbox("Filter by Position:", positions, key="results_position_filter")
         
         with col2:
-            stakes = ['All Stakes'] + sorted(list(self.df['Stakes'].unique()))
+            stakes = ['All Stakes'] + self._unique['Stakes']
             selected_stakes = st.selectbox("Filter by Stakes:", stakes, key="results_stakes_filter")
         
         with col3:
-            # Define pot types in logical order
-            pot_type_order = ['All Pot Types', 'Preflop Only', 'Limped Pot', 'SRP', '3-Bet Pot', '4-Bet Pot', '5+ Bet Pot']
-            available_pot_types = ['All Pot Types'] + [pt for pt in pot_type_order[1:] if pt in self.df['Pot_Type'].unique()]
-            selected_pot_type = st.selectbox("Filter by Pot Type:", available_pot_types, key="results_pot_type_filter")
-        
-        # Filter data by position, stakes, and pot type
-        filtered_df = self.df.copy()
+            selected_pot_type = st.selectbox("Filter by Pot Type:", self._available_pot_types, key="results_pot_type_filter")
         
-        if selected_position != 'All Positions':
-            filtered_df = filtered_df[filtered_df['Position'] == selected_position]
+        series = _showdown_series(self.df, self.frame_key, selected_position, selected_stakes, selected_pot_type)
         
-        if selected_stakes != 'All Stakes':
-            filtered_df = filtered_df[filtered_df['Stakes'] == selected_stakes]
-        
-        if selected_pot_type != 'All Pot Types':
-            filtered_df = filtered_df[filtered_df['Pot_Type'] == selected_pot_type]
-        
-        if filtered_df.empty:
+        if series is None:
             filter_desc = []
             if selected_position != 'All Positions':
                 filter_desc.append(f"position: {selected_position}")
@@ -483,89 +772,14 @@ class HeroDataAnalyzer:
             st.warning(f"No data available for {', '.join(filter_desc)}")
             return
         
-        # Calculate showdown vs non-showdown winnings
-        filtered_df['Showdown_Profit'] = 0.0
-        filtered_df['Non_Showdown_Profit'] = 0.0
-        
-        # For each hand, categorize profit based on showdown status
-        for idx, row in filtered_df.iterrows():
-            if row['Went_to_Showdown']:
-                # Any hand that went to showdown (win or lose) goes to showdown category
-                filtered_df.at[idx, 'Showdown_Profit'] = row['Net_Profit']
-            else:
-                # No showdown - all profit goes to non-showdown
-                filtered_df.at[idx, 'Non_Showdown_Profit'] = row['Net_Profit']
-        
-        # Calculate cumulative values
-        filtered_df['Running_Showdown_Profit'] = filtered_df['Showdown_Profit'].cumsum()
-        filtered_df['Running_Non_Showdown_Profit'] = filtered_df['Non_Showdown_Profit'].cumsum()
-        filtered_df['Running_Total_Profit'] = filtered_df['Net_Profit'].cumsum()
-        
-        # Create the chart
-        fig = go.Figure()
-        
-        # Add non-showdown winnings (red line)
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_df['Hand_Number'], 
-                y=filtered_df['Running_Non_Showdown_Profit'],
-                name='Non-Showdown Profit',
-                line=dict(color='red', width=2),
-                hovertemplate='Hand %{x}<br>Non-Showdown: $%{y:.2f}<extra></extra>'
-            )
-        )
-        
-        # Add showdown winnings (blue line)
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_df['Hand_Number'], 
-                y=filtered_df['Running_Showdown_Profit'],
-                name='Showdown Profit',
-                line=dict(color='blue', width=2),
-                hovertemplate='Hand %{x}<br>Showdown: $%{y:.2f}<extra></extra>'
-            )
-        )
-        
-        # Add cumulative profit (green line)
-        fig.add_trace(
-            go.Scatter(
-                x=filtered_df['Hand_Number'], 
-                y=filtered_df['Running_Total_Profit'],
-                name='Total Profit',
-                line=dict(color='green', width=3),
-                hovertemplate='Hand %{x}<br>Total: $%{y:.2f}<extra></extra>'
-            )
-        )
-        
-        # Add zero line
-        fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-        
-        # Update layout with filter info in title
-        filter_parts = []
-        if selected_position != 'All Positions':
-            filter_parts.append(selected_position)
-        if selected_stakes != 'All Stakes':
-            filter_parts.append(selected_stakes)
-        if selected_pot_type != 'All Pot Types':
-            filter_parts.append(selected_pot_type)
-        
-        filter_text = f" - {' | '.join(filter_parts)}" if filter_parts else ""
-        fig.update_layout(
-            title=f"Showdown vs Non-Showdown Winnings{filter_text}",
-            xaxis_title="Hand Number",
-            yaxis_title="Cumulative Profit ($)",
-            height=500,
-            showlegend=True,
-            hovermode='x unified'
-        )
-        
+        fig = _build_showdown_fig(self.df, self.frame_key, selected_position, selected_stakes, selected_pot_type)
         st.plotly_chart(fig, use_container_width=True)
         
         # Add summary statistics
-        total_showdown_profit = filtered_df['Showdown_Profit'].sum()
-        total_non_showdown_profit = filtered_df['Non_Showdown_Profit'].sum()
-        showdown_hands = (filtered_df['Showdown_Profit'] != 0).sum()
-        non_showdown_hands = (filtered_df['Non_Showdown_Profit'] != 0).sum()
+        total_showdown_profit = series['total_showdown']
+        total_non_showdown_profit = series['total_non_showdown']
+        showdown_hands = series['showdown_hands']
+        non_showdown_hands = series['non_showdown_hands']
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -582,18 +796,7 @@ class HeroDataAnalyzer:
         if self.df is None or self.df.empty:
             return
         
-        position_stats = self.df.groupby('Position').agg({
-            'Net_Profit': ['count', 'sum', 'mean'],
-            'Went_to_Showdown': 'mean',
-            'Won_When_Saw_Flop': 'mean',
-            'Preflop_Raised': 'mean',
-            'CBet_Flop': 'mean'
-        }).round(3)
-        
-        position_stats.columns = [
-            'Hands', 'Total_Profit', 'Avg_Profit', 
-            'Showdown_Rate', 'Flop_Win_Rate', 'Preflop_Raise_Rate', 'CBet_Rate'
-        ]
+        position_stats = _position_stats(self.df, self.frame_key)
         
         st.subheader("Position Analysis")
         st.dataframe(position_stats, use_container_width=True)
@@ -604,28 +807,7 @@ class HeroDataAnalyzer:
             return
         
         # Calculate stakes statistics
-        stakes_stats = self.df.groupby('Stakes').agg({
-            'Net_Profit': ['count', 'sum', 'mean'],
-            'Went_to_Showdown': 'mean',
-            'Won_When_Saw_Flop': 'mean'
-        }).round(3)
-        
-        stakes_stats.columns = ['Hands', 'Total_Profit', 'Avg_Profit', 'Showdown_Rate', 'Flop_Win_Rate']
-        stakes_stats = stakes_stats.reset_index()
-        
-        # Extract big blind value from stakes string (e.g., "$0.02/$0.05" -> 0.05)
-        def extract_bb(stakes_str):
-            try:
-                # Remove dollar signs and split on forward slash
-                parts = stakes_str.replace('$', '').split('/')
-                if len(parts) >= 2:
-                    return float(parts[1].strip())
-                return 1.0  # Default if parsing fails
-            except:
-                return 1.0
-        
-        stakes_stats['BB'] = stakes_stats['Stakes'].apply(extract_bb)
-        stakes_stats['Profit_BB'] = stakes_stats['Total_Profit'] / stakes_stats['BB']
+        stakes_stats = _stakes_stats(self.df, self.frame_key)
         
         # Create two bar charts side by side
         col1, col2 = st.columns(2)
@@ -640,10 +822,10 @@ class HeroDataAnalyzer:
                 labels={'Stakes': 'Stakes Level', 'Total_Profit': 'Total Profit ($)'},
                 color='Total_Profit',
                 color_continuous_scale=['red', 'yellow', 'green'],
-                text='Total_Profit'
+                text='_cash_label'
             )
             
-            fig_cash.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+            fig_cash.update_traces(textposition='outside')
             fig_cash.update_layout(
                 xaxis_title="Stakes Level",
                 yaxis_title="Total Profit ($)",
@@ -666,10 +848,10 @@ class HeroDataAnalyzer:
                 labels={'Stakes': 'Stakes Level', 'Profit_BB': 'Total Profit (BB)'},
                 color='Profit_BB',
                 color_continuous_scale=['red', 'yellow', 'green'],
-                text='Profit_BB'
+                text='_bb_label'
             )
             
-            fig_bb.update_traces(texttemplate='%{text:.1f} BB', textposition='outside')
+            fig_bb.update_traces(textposition='outside')
             fig_bb.update_layout(
                 xaxis_title="Stakes Level",
                 yaxis_title="Total Profit (BB)",
@@ -684,9 +866,9 @@ class HeroDataAnalyzer:
         
         # Display summary table below charts
         st.subheader("Stakes Summary")
-        display_stats = stakes_stats[['Stakes', 'Hands', 'Total_Profit', 'Profit_BB', 'Avg_Profit']].copy()
-        display_stats['Total_Profit'] = display_stats['Total_Profit'].apply(lambda x: f"${x:.2f}")
-        display_stats['Profit_BB'] = display_stats['Profit_BB'].apply(lambda x: f"{x:.1f} BB")
+        display_stats = stakes_stats[['Stakes', 'Hands', '_cash_label', '_bb_label', 'Avg_Profit']].rename(
+            columns={'_cash_label': 'Total_Profit', '_bb_label': 'Profit_BB'}
+        )
         display_stats['Avg_Profit'] = display_stats['Avg_Profit'].apply(lambda x: f"${x:.3f}")
         st.dataframe(display_stats, use_container_width=True, hide_index=True)
     
@@ -702,34 +884,41 @@ class HeroDataAnalyzer:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            positions = ['All'] + list(self.df['Position'].unique())
+            positions = ['All'] + self._unique['Position']
             selected_position = st.selectbox("Filter by Position", positions)
         
         with col2:
-            stakes = ['All'] + list(self.df['Stakes'].unique())
+            stakes = ['All'] + self._unique['Stakes']
             selected_stakes = st.selectbox("Filter by Stakes", stakes)
         
         with col3:
             show_showdown_only = st.checkbox("Show showdown hands only")
         
-        # Apply filters
-        filtered_df = self.df.copy()
+        # Apply filters as one compound mask, then slice once
+        mask = np.ones(len(self.df), dtype=bool)
         
         if selected_position != 'All':
-            filtered_df = filtered_df[filtered_df['Position'] == selected_position]
+            mask &= equals_mask(self.df['Position'], selected_position)
         
         if selected_stakes != 'All':
-            filtered_df = filtered_df[filtered_df['Stakes'] == selected_stakes]
+            mask &= equals_mask(self.df['Stakes'], selected_stakes)
         
         if show_showdown_only:
-            filtered_df = filtered_df[filtered_df['Went_to_Showdown'] == True]
+            mask &= self.df['Went_to_Showdown'].to_numpy(dtype=bool)
+        
+        # Only ship the first rows_to_show matches to the browser
+        rows_to_show = st.number_input("Rows to show", min_value=100, max_value=10000, value=500, step=100)
+        matches = np.flatnonzero(mask)
+        display_df = self.df.iloc[matches[:rows_to_show]][DETAIL_COLUMNS]
         
         # Display data
+        st.caption(f"Showing {len(display_df):,} of {len(matches):,} matching hands")
         st.dataframe(
-            filtered_df[['Hand_ID', 'Timestamp', 'Position', 'Stakes', 'Hole_Cards', 
-                       'Net_Profit', 'Went_to_Showdown', 'Won_When_Saw_Flop', 
-                       'Preflop_Raised', 'CBet_Flop']],
-            use_container_width=True
+            display_df,
+            use_container_width=True,
+            column_config={
+                'Net_Profit': st.column_config.NumberColumn('Net_Profit', format="$%.2f")
+            }
         )
     
     def export_data(self):
@@ -737,14 +926,18 @@ class HeroDataAnalyzer:
         if self.df is None or self.df.empty:
             return
         
-        csv = self.df.to_csv(index=False)
+        # Encoded on click rather than on every rerun of the page
         st.download_button(
             label="Download Hero Analysis Data (CSV)",
-            data=csv,
+            data=lambda: _export_csv(self.df, self.frame_key),
             file_name=f"hero_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
             mime="text/csv"
         )
 
+def _reset_scan_cache():
+    """Forget cached folder scans when the folder path input changes"""
+    st.session_state.pop('scan_cache', None)
+
 def main():
     # Header with logo
     col1, col2 = st.columns([1, 4])
@@ -779,7 +972,7 @@ def main():
         # Try Demo button
         st.markdown("**Want to just try with my hand histories?**")
         if st.button("Load a very losing sample", type="secondary", use_container_width=True):
-            if analyzer.load_data("hand_histories"):
+            if analyzer.load_data("hand_histories", st.session_state.get('parse_workers')):
                 st.success(f"✅ Loaded {len(analyzer.df)} demo hands!")
                 st.rerun()
             else:
@@ -822,16 +1015,19 @@ def main():
                 "Folder path",
                 "hand_histories",
                 help="Enter the path to folder containing your hand history files",
-                label_visibility="collapsed"
+                label_visibility="collapsed",
+                on_change=_reset_scan_cache
             )
             
-            # Show folder info if path exists
+            # Show folder info if path exists (scanned once per path)
+            scanned = st.session_state.setdefault('scan_cache', {})
             if os.path.exists(folder_path):
                 try:
-                    file_pattern = os.path.join(folder_path, '**', '*.txt')
-                    all_files = glob.glob(file_pattern, recursive=True)
-                    if all_files:
-                        st.success(f"✅ Found {len(all_files)} .txt file(s) in this folder")
+                    if folder_path not in scanned:
+                        scanned[folder_path] = len(find_txt_files(folder_path))
+                    n_files = scanned[folder_path]
+                    if n_files:
+                        st.success(f"✅ Found {n_files} .txt file(s) in this folder")
                     else:
                         st.warning(f"⚠️ No .txt files found in '{folder_path}'")
                 except Exception as e:
@@ -839,8 +1035,19 @@ def main():
             elif folder_path and folder_path != "hand_histories":
                 st.error(f"❌ Folder not found: '{folder_path}'")
             
+            cpu_count = os.cpu_count() or 1
+            if cpu_count > 1:
+                st.slider(
+                    "Parser processes",
+                    min_value=1,
+                    max_value=cpu_count,
+                    value=cpu_count,
+                    key="parse_workers",
+                    help="Number of processes used to parse hand history files in parallel"
+                )
+            
             if st.button("🔄 Load from Path", type="primary"):
-                if analyzer.load_data(folder_path):
+                if analyzer.load_data(folder_path, st.session_state.get('parse_workers')):
                     st.success(f"✅ Successfully loaded {len(analyzer.df)} hands!")
                 else:
                     st.error("❌ No data found. Please check the folder path.")
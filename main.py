@@ -1,12 +1,22 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import io
 import os
-import glob
 import re
-from hero_analysis_parser import HeroAnalysisParser
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from hero_analysis_parser import (
+    HeroAnalysisParser, find_txt_files, folder_signature, parse_one_upload, read_raw_spans, join_raw_spans
+)
+from hero_analysis_helpers import (
+    compact_dtypes, content_digest, equals_mask, chart_indices, source_key,
+    POSITION_RATE_COLUMNS, STAKES_RATE_COLUMNS
+)
 from datetime import datetime, timedelta
 
 # Page configuration
@@ -18,7 +28,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS_STR = """
 <style>
     /* Main metrics styling */
     [data-testid="stMetricValue"] {
@@ -163,95 +173,487 @@ st.markdown("""
         font-weight: bold;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_CSS_STR, unsafe_allow_html=True)
+
+# Repeated low-cardinality strings stored as categoricals
+CATEGORY_COLUMNS = ['Position', 'Stakes', 'Pot_Type', 'Site', 'Table_Name']
+
+# Columns shown in the detailed hand table
+DETAIL_COLUMNS = [
+    'Hand_ID', 'Timestamp', 'Position', 'Stakes', 'Hole_Cards',
+    'Net_Profit', 'Total_Pot_Size', 'Pot_Type', 'VPIP',
+    'Saw_Flop', 'Went_to_Showdown', 'Won_When_Saw_Flop',
+    'Preflop_Raised', 'Three_Bet', 'Four_Bet', 'CBet_Flop'
+]
+
+# Source file and byte range of each hand, kept for folder loads instead of the text itself
+RAW_SPAN_COLUMNS = ['Raw_Path', 'Raw_Start', 'Raw_End']
+
+# Cap on points sent to the browser per results-chart trace
+MAX_CHART_POINTS = 5_000
+
+# Per-hand flags stored as NumPy bool
+BOOL_COLUMNS = [
+    'Went_to_Showdown', 'Won_at_Showdown', 'Won_When_Saw_Flop', 'Saw_Flop',
+    'Preflop_Raised', 'Preflop_Called', 'VPIP', 'Three_Bet', 'Four_Bet',
+    'Three_Bet_Opportunity', 'Four_Bet_Opportunity',
+    'CBet_Flop', 'CBet_Turn', 'CBet_River',
+    'CBet_Flop_Opportunity', 'CBet_Turn_Opportunity', 'CBet_River_Opportunity'
+]
+
+# Per-hand amounts stored as float32. Net_Profit stays float64: the profit-range filter
+# compares it against exact slider bounds
+MONEY_COLUMNS = [
+    'Total_Contributed', 'Total_Collected', 'Rake_Amount',
+    'Net_Profit_Before_Rake', 'Total_Pot_Size'
+]
+
+def _compact_dtypes(df):
+    """Shrink a loaded frame in place with this app's column lists"""
+    return compact_dtypes(df, CATEGORY_COLUMNS, BOOL_COLUMNS, MONEY_COLUMNS)
+
+def _split_raw_text(df):
+    """Move raw hand text (or its file byte spans) out of the frame, keyed by the frame's index"""
+    if 'Raw_Text' in df.columns:
+        return df, df.pop('Raw_Text')
+    if 'Raw_Path' in df.columns:
+        spans = df[RAW_SPAN_COLUMNS].astype({'Raw_Path': 'category'})
+        return df.drop(columns=RAW_SPAN_COLUMNS), spans
+    return df, pd.Series(dtype=object)
+
+def _run_parse(func, *args):
+    """(result, None) from func(*args), or (None, message) if it raised"""
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, str(e)
+
+@st.cache_data(show_spinner="Parsing hand histories...", max_entries=8)
+def _parse_uploads(_file_tuples, upload_key):
+    """Parse uploaded (name, bytes) pairs into a DataFrame, its raw hand texts and per-file errors
+    
+    The payload is not hashed by Streamlit; upload_key (names and content digests) keys the cache.
+    """
+    frames = []
+    errors = []
+    
+    # Regex parsing is CPU-bound, so files go to worker processes rather than threads
+    if len(_file_tuples) == 1:
+        results = [_run_parse(parse_one_upload, data) for _, data in _file_tuples]
+    else:
+        # Spawned workers, since forking Streamlit's multi-threaded server process is unsafe
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = [executor.submit(parse_one_upload, data) for _, data in _file_tuples]
+            results = [_run_parse(future.result) for future in futures]
+    
+    for (name, _), (frame, error) in zip(_file_tuples, results):
+        if error is not None:
+            errors.append((name, error))
+        elif frame is not None:
+            frames.append(frame)
+    
+    if not frames:
+        return pd.DataFrame(), pd.Series(dtype=object), errors
+    
+    # Same column layout and running totals as parser.process_files
+    df = pd.concat(frames, ignore_index=True)
+    df = df.sort_values('Timestamp')
+    df['Running_Profit'] = df['Net_Profit'].cumsum()
+    df['Running_Profit_Before_Rake'] = df['Net_Profit_Before_Rake'].cumsum()
+    df['Running_Rake'] = df['Rake_Amount'].cumsum()
+    df['Hand_Number'] = range(1, len(df) + 1)
+    df, raw_texts = _split_raw_text(df)
+    return _compact_dtypes(df), raw_texts, errors
+
+@st.cache_data(show_spinner=False, max_entries=8, persist="disk")
+def _parse_folder(folder_path, signature):
+    """Parse a hand history folder (frame, raw hand texts) once per file signature; persisted across app restarts"""
+    df, raw_texts = _split_raw_text(HeroAnalysisParser().process_files(folder_path, raw_spans=True))
+    return _compact_dtypes(df), raw_texts
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _filter_positions(_df, frame_key, filters):
+    """Row positions matching one detailed-data filter selection; every condition is and-ed into one mask"""
+    (selected_position, selected_stakes, selected_pot_type, hole_cards_filter, profit_range,
+     result_filter, flop_filter, showdown_filter, vpip_filter, preflop_action,
+     three_bet_filter, cbet_filter, date_range) = filters
+    mask = np.ones(len(_df), dtype=bool)
+    
+    if selected_position != 'All':
+        mask &= equals_mask(_df['Position'], selected_position)
+    
+    if selected_stakes != 'All':
+        mask &= equals_mask(_df['Stakes'], selected_stakes)
+    
+    if selected_pot_type != 'All':
+        mask &= equals_mask(_df['Pot_Type'], selected_pot_type)
+    
+    # Hole cards filter
+    if hole_cards_filter:
+        hole_cards_upper = hole_cards_filter.upper().strip()
+        mask &= _df['Hole_Cards'].str.contains(hole_cards_upper, na=False, regex=False).to_numpy(dtype=bool)
+    
+    # Profit range filter (None when the slider spans every hand)
+    profit = _df['Net_Profit'].to_numpy()
+    if profit_range is not None:
+        mask &= (profit >= profit_range[0]) & (profit <= profit_range[1])
+    
+    # Result filter
+    if result_filter == "Winners Only":
+        mask &= profit > 0
+    elif result_filter == "Losers Only":
+        mask &= profit < 0
+    elif result_filter == "Breakeven":
+        mask &= profit == 0
+    
+    # Flop filter
+    if flop_filter == "Saw Flop":
+        mask &= _df['Saw_Flop'].to_numpy()
+    elif flop_filter == "Didn't See Flop":
+        mask &= ~_df['Saw_Flop'].to_numpy()
+    
+    # Showdown filter
+    if showdown_filter == "Went to Showdown":
+        mask &= _df['Went_to_Showdown'].to_numpy()
+    elif showdown_filter == "No Showdown":
+        mask &= ~_df['Went_to_Showdown'].to_numpy()
+    
+    # VPIP filter
+    if vpip_filter == "VPIP Only":
+        mask &= _df['VPIP'].to_numpy()
+    elif vpip_filter == "Folded Preflop":
+        mask &= ~_df['VPIP'].to_numpy()
+    
+    # Preflop action filter
+    if preflop_action == "Raised":
+        mask &= _df['Preflop_Raised'].to_numpy()
+    elif preflop_action == "Called":
+        mask &= _df['Preflop_Called'].to_numpy()
+    elif preflop_action == "Folded":
+        mask &= ~(_df['Preflop_Raised'].to_numpy() | _df['Preflop_Called'].to_numpy())
+    
+    # 3-Bet filter
+    if three_bet_filter == "3-Bet":
+        mask &= _df['Three_Bet'].to_numpy()
+    elif three_bet_filter == "No 3-Bet":
+        mask &= ~_df['Three_Bet'].to_numpy()
+    
+    # C-Bet filter
+    if cbet_filter == "C-Bet Flop":
+        mask &= _df['CBet_Flop'].to_numpy()
+    elif cbet_filter == "No C-Bet":
+        mask &= ~_df['CBet_Flop'].to_numpy()
+    
+    # Date range filter (None when it spans every hand): both loaders sort by Timestamp,
+    # so the range is one contiguous slice found by binary search, end date inclusive
+    if date_range is not None:
+        start_date, end_date = date_range
+        ts = _df['Timestamp'].to_numpy()
+        lo = np.searchsorted(ts, np.datetime64(start_date), side='left')
+        hi = np.searchsorted(ts, np.datetime64(end_date) + np.timedelta64(1, 'D'), side='left')
+        mask[:lo] = False
+        mask[hi:] = False
+    
+    return np.flatnonzero(mask)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _search_positions(_df, frame_key, filters, query):
+    """Positions within one filter selection whose Hand_ID contains query, ignoring case"""
+    hand_ids = _df['Hand_ID'].iloc[_filter_positions(_df, frame_key, filters)]
+    return np.flatnonzero(hand_ids.str.contains(query, case=False, na=False, regex=False).to_numpy(dtype=bool))
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _filtered_csv(_df, frame_key, filters):
+    """CSV export of one detailed-data filter selection"""
+    return _df.iloc[_filter_positions(_df, frame_key, filters)].to_csv(index=False)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _key_metrics(_df, frame_key):
+    """Calculate key performance metrics, cached per loaded DataFrame"""
+    df = _df
+    # Widen the float32 amounts back to exact cents before summing
+    money = df[['Net_Profit', 'Net_Profit_Before_Rake', 'Rake_Amount', 'Total_Pot_Size']].astype('float64').round(2)
+    
+    total_hands = len(df)
+    total_profit = money['Net_Profit'].sum()
+    total_profit_before_rake = money['Net_Profit_Before_Rake'].sum()
+    total_rake = money['Rake_Amount'].sum()
+    avg_profit = money['Net_Profit'].mean()
+    avg_profit_before_rake = money['Net_Profit_Before_Rake'].mean()
+    avg_rake = money['Rake_Amount'].mean()
+    total_pot_size = money['Total_Pot_Size'].sum()
+    rake_percentage = (total_rake / total_pot_size * 100) if total_pot_size > 0 else 0
+    
+    # VPIP metrics (separate from PFR)
+    vpip_hands = df['VPIP'].sum()
+    vpip_rate = (vpip_hands / total_hands) * 100 if total_hands > 0 else 0
+    
+    # Flop metrics
+    saw_flop = df['Saw_Flop'].sum()
+    flop_rate = (saw_flop / total_hands) * 100 if total_hands > 0 else 0
+    
+    won_when_saw_flop = df['Won_When_Saw_Flop'].sum()
+    flop_win_rate = (won_when_saw_flop / saw_flop) * 100 if saw_flop > 0 else 0
+    
+    # Showdown metrics (only calculated on hands where Hero saw flop)
+    went_to_showdown = df['Went_to_Showdown'].sum()
+    showdown_rate = (went_to_showdown / saw_flop) * 100 if saw_flop > 0 else 0
+    
+    # Won at showdown (W$SD) - percentage of showdowns won
+    won_at_showdown = df['Won_at_Showdown'].sum()
+    won_at_showdown_rate = (won_at_showdown / went_to_showdown) * 100 if went_to_showdown > 0 else 0
+    
+    # Preflop metrics
+    preflop_raised = df['Preflop_Raised'].sum()
+    preflop_raise_rate = (preflop_raised / total_hands) * 100 if total_hands > 0 else 0
+    
+    preflop_called = df['Preflop_Called'].sum()
+    preflop_call_rate = (preflop_called / total_hands) * 100 if total_hands > 0 else 0
+    
+    # 3-bet metrics
+    three_bet = df['Three_Bet'].sum()
+    three_bet_opportunities = df['Three_Bet_Opportunity'].sum()
+    three_bet_rate = (three_bet / three_bet_opportunities * 100) if three_bet_opportunities > 0 else 0
+    
+    # 4-bet metrics
+    four_bet = df['Four_Bet'].sum()
+    four_bet_opportunities = df['Four_Bet_Opportunity'].sum()
+    four_bet_rate = (four_bet / four_bet_opportunities * 100) if four_bet_opportunities > 0 else 0
+    
+    # C-bet metrics
+    cbet_flop = df['CBet_Flop'].sum()
+    cbet_turn = df['CBet_Turn'].sum()
+    cbet_river = df['CBet_River'].sum()
+    
+    # C-bet opportunities
+    cbet_flop_opportunities = df['CBet_Flop_Opportunity'].sum()
+    cbet_turn_opportunities = df['CBet_Turn_Opportunity'].sum()
+    cbet_river_opportunities = df['CBet_River_Opportunity'].sum()
+    
+    # C-bet rates (as percentage of opportunities)
+    cbet_flop_rate = (cbet_flop / cbet_flop_opportunities * 100) if cbet_flop_opportunities > 0 else 0
+    cbet_turn_rate = (cbet_turn / cbet_turn_opportunities * 100) if cbet_turn_opportunities > 0 else 0
+    cbet_river_rate = (cbet_river / cbet_river_opportunities * 100) if cbet_river_opportunities > 0 else 0
+    
+    return {
+        'total_hands': total_hands,
+        'total_profit': total_profit,
+        'total_profit_before_rake': total_profit_before_rake,
+        'total_rake': total_rake,
+        'avg_profit': avg_profit,
+        'avg_profit_before_rake': avg_profit_before_rake,
+        'avg_rake': avg_rake,
+        'rake_percentage': rake_percentage,
+        'vpip_hands': vpip_hands,
+        'vpip_rate': vpip_rate,
+        'went_to_showdown': went_to_showdown,
+        'showdown_rate': showdown_rate,
+        'saw_flop': saw_flop,
+        'flop_rate': flop_rate,
+        'won_when_saw_flop': won_when_saw_flop,
+        'flop_win_rate': flop_win_rate,
+        'won_at_showdown': won_at_showdown,
+        'won_at_showdown_rate': won_at_showdown_rate,
+        'preflop_raised': preflop_raised,
+        'preflop_raise_rate': preflop_raise_rate,
+        'preflop_called': preflop_called,
+        'preflop_call_rate': preflop_call_rate,
+        'three_bet': three_bet,
+        'three_bet_opportunities': three_bet_opportunities,
+        'three_bet_rate': three_bet_rate,
+        'four_bet': four_bet,
+        'four_bet_opportunities': four_bet_opportunities,
+        'four_bet_rate': four_bet_rate,
+        'cbet_flop': cbet_flop,
+        'cbet_turn': cbet_turn,
+        'cbet_river': cbet_river,
+        'cbet_flop_opportunities': cbet_flop_opportunities,
+        'cbet_turn_opportunities': cbet_turn_opportunities,
+        'cbet_river_opportunities': cbet_river_opportunities,
+        'cbet_flop_rate': cbet_flop_rate,
+        'cbet_turn_rate': cbet_turn_rate,
+        'cbet_river_rate': cbet_river_rate
+    }
+
+def _category_stats(df, key, rate_columns):
+    """Hands, profit and flag rates per observed category of key, via bincount on the category codes"""
+    codes = df[key].cat.codes.to_numpy()
+    valid = codes >= 0
+    codes = codes[valid]
+    categories = df[key].cat.categories
+    
+    hands = np.bincount(codes, minlength=len(categories))
+    observed = hands > 0
+    hands = hands[observed]
+    
+    def per_category_sum(col):
+        return np.bincount(codes, weights=df[col].to_numpy()[valid], minlength=len(categories))[observed]
+    
+    total_profit = per_category_sum('Net_Profit')
+    stats = {'Hands': hands, 'Total_Profit': total_profit, 'Avg_Profit': total_profit / hands}
+    for rate, col in rate_columns.items():
+        stats[rate] = per_category_sum(col) / hands
+    return pd.DataFrame(stats, index=pd.Index(categories[observed], name=key)).round(3)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _position_stats(_df, frame_key):
+    """Aggregate per-position statistics, cached per loaded DataFrame"""
+    return _category_stats(_df, 'Position', POSITION_RATE_COLUMNS)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _stakes_stats(_df, frame_key):
+    """Aggregate per-stakes statistics and profit in big blinds, cached per loaded DataFrame"""
+    stakes_stats = _category_stats(_df, 'Stakes', STAKES_RATE_COLUMNS).reset_index()
+    
+    # Extract big blind value from stakes string (e.g., "$0.02/$0.05" -> 0.05), defaulting to 1.0
+    bb = (stakes_stats['Stakes'].astype(str)
+          .str.replace('$', '', regex=False)
+          .str.split('/', n=1).str[1]
+          .str.strip())
+    stakes_stats['BB'] = pd.to_numeric(bb, errors='coerce').fillna(1.0)
+    stakes_stats['Profit_BB'] = stakes_stats['Total_Profit'] / stakes_stats['BB']
+    return stakes_stats
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _stakes_figures(_df, frame_key):
+    """Stakes profit bar charts ($ and BB) plus the formatted summary table, cached per loaded DataFrame"""
+    stakes_stats = _stakes_stats(_df, frame_key)
+    
+    # Cash profit bar chart
+    fig_cash = px.bar(
+        stakes_stats,
+        x='Stakes',
+        y='Total_Profit',
+        title='Profit by Stakes ($)',
+        labels={'Stakes': 'Stakes Level', 'Total_Profit': 'Total Profit ($)'},
+        color='Total_Profit',
+        color_continuous_scale=['red', 'yellow', 'green'],
+        text='Total_Profit'
+    )
+    
+    fig_cash.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
+    fig_cash.update_layout(
+        xaxis_title="Stakes Level",
+        yaxis_title="Total Profit ($)",
+        showlegend=False,
+        height=400
+    )
+    
+    # Add zero line
+    fig_cash.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    
+    # BB profit bar chart
+    fig_bb = px.bar(
+        stakes_stats,
+        x='Stakes',
+        y='Profit_BB',
+        title='Profit by Stakes (BB)',
+        labels={'Stakes': 'Stakes Level', 'Profit_BB': 'Total Profit (BB)'},
+        color='Profit_BB',
+        color_continuous_scale=['red', 'yellow', 'green'],
+        text='Profit_BB'
+    )
+    
+    fig_bb.update_traces(texttemplate='%{text:.1f} BB', textposition='outside')
+    fig_bb.update_layout(
+        xaxis_title="Stakes Level",
+        yaxis_title="Total Profit (BB)",
+        showlegend=False,
+        height=400
+    )
+    
+    # Add zero line
+    fig_bb.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+    
+    display_stats = stakes_stats[['Stakes', 'Hands', 'Total_Profit', 'Profit_BB', 'Avg_Profit']].copy()
+    display_stats['Total_Profit'] = display_stats['Total_Profit'].apply(lambda x: f"${x:.2f}")
+    display_stats['Profit_BB'] = display_stats['Profit_BB'].apply(lambda x: f"{x:.1f} BB")
+    display_stats['Avg_Profit'] = display_stats['Avg_Profit'].apply(lambda x: f"${x:.3f}")
+    return fig_cash, fig_bb, display_stats
 
 class HeroDataAnalyzer:
     def __init__(self):
         self.parser = HeroAnalysisParser()
         self.df = None
+        # Content-derived key of the loaded frame for the per-frame caches
+        self.frame_key = None
+        # Raw hand history by df index label, kept outside the frame so filters never copy it:
+        # a Series of text for uploads, or a frame of RAW_SPAN_COLUMNS for folder loads
+        self.raw_texts = None
+        self._positions = []
+        self._stakes = []
+        self._pot_types = []
+        self._available_pot_types = []
+    
+    def _finalize_frame(self):
+        """Cache the sorted filter options of a freshly loaded frame"""
+        if self.df.empty:
+            return
+        self._positions = sorted(self.df['Position'].cat.categories)
+        self._stakes = sorted(self.df['Stakes'].cat.categories)
+        self._pot_types = sorted(self.df['Pot_Type'].cat.categories)
+        self._available_pot_types = list(self.df['Pot_Type'].cat.categories)
+    
+    def _has_raw_text(self):
+        """Whether raw hand histories are available for download"""
+        return self.raw_texts is not None and not self.raw_texts.empty
+    
+    def _raw_hand_texts(self, labels):
+        """Raw hand histories for df index labels, read from the source files for folder loads"""
+        if isinstance(self.raw_texts, pd.DataFrame):
+            spans = self.raw_texts.loc[labels]
+            return read_raw_spans(spans['Raw_Path'], spans['Raw_Start'], spans['Raw_End'])
+        return self.raw_texts.loc[labels].tolist()
+    
+    def _raw_hand_export(self, labels):
+        """Raw hand histories for df index labels as one blank-line separated download"""
+        if isinstance(self.raw_texts, pd.DataFrame):
+            spans = self.raw_texts.loc[labels]
+            return join_raw_spans(spans['Raw_Path'], spans['Raw_Start'], spans['Raw_End'])
+        return '\n\n'.join(self._raw_hand_texts(labels))
+    
+    def _raw_hand_zip(self, labels, hand_ids):
+        """ZIP archive holding one hand_<id>_<row>.txt per hand"""
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as archive:
+            # Hand IDs repeat across sites and tables, so the row label keeps member names unique
+            for label, hand_id, text in zip(labels, hand_ids, self._raw_hand_texts(labels)):
+                archive.writestr(f"hand_{hand_id}_{label}.txt", text)
+        return buf.getvalue()
     
     def load_data(self, folder_path: str):
         """Load and process hand history data from folder"""
+        # The signature scan needs a readable directory; report a bad path as no data
+        if not os.path.isdir(folder_path):
+            return False
         with st.spinner("Loading and analyzing hand histories..."):
-            self.df = self.parser.process_files(folder_path)
+            signature = folder_signature(folder_path)
+            self.df, self.raw_texts = _parse_folder(folder_path, signature)
+            self.frame_key = source_key(folder_path, signature)
+            self._finalize_frame()
         return not self.df.empty
     
     def load_uploaded_files(self, uploaded_files):
         """Load and process hand history data from uploaded files"""
         with st.spinner(f"Processing {len(uploaded_files)} uploaded file(s)..."):
-            all_hands = []
+            # Read each upload once; the cache is keyed on names and content digests
+            file_tuples = tuple((f.name, f.getvalue()) for f in uploaded_files)
+            upload_key = tuple((name, content_digest(data)) for name, data in file_tuples)
+            df, raw_texts, errors = _parse_uploads(file_tuples, upload_key)
             
-            for uploaded_file in uploaded_files:
-                try:
-                    # Read the file content
-                    text = uploaded_file.read().decode('utf-8')
-                    
-                    # Parse the file
-                    hands = self.parser.parse_file(text)
-                    all_hands.extend(hands)
-                    
-                except Exception as e:
-                    st.warning(f"Error processing {uploaded_file.name}: {e}")
-                    continue
+            for name, error in errors:
+                st.warning(f"Error processing {name}: {error}")
             
-            if not all_hands:
+            if df.empty:
                 st.error("No hands could be processed from uploaded files")
                 return False
             
-            # Convert to DataFrame (same logic as in parser.process_files)
-            data = []
-            for hand in all_hands:
-                data.append({
-                    'Hand_ID': hand.hand_id,
-                    'Timestamp': hand.timestamp,
-                    'Site': hand.site,
-                    'Stakes': hand.stakes,
-                    'Table_Name': hand.table_name,
-                    'Position': hand.position,
-                    'Hole_Cards': ' '.join(hand.hole_cards),
-                    'Went_to_Showdown': hand.went_to_showdown,
-                    'Won_at_Showdown': hand.won_at_showdown,
-                    'Won_When_Saw_Flop': hand.won_when_saw_flop,
-                    'Saw_Flop': hand.saw_flop,
-                    'Total_Contributed': hand.total_contributed,
-                    'Total_Collected': hand.total_collected,
-                    'Net_Profit': hand.net_profit,
-                    'Rake_Amount': hand.rake_amount,
-                    'Net_Profit_Before_Rake': hand.net_profit_before_rake,
-                    'Total_Pot_Size': hand.total_pot_size,
-                    'Preflop_Actions': hand.preflop_actions,
-                    'Flop_Actions': hand.flop_actions,
-                    'Turn_Actions': hand.turn_actions,
-                    'River_Actions': hand.river_actions,
-                    'Flop_Cards': ' '.join(hand.flop_cards),
-                    'Turn_Card': hand.turn_card,
-                    'River_Card': hand.river_card,
-                    'Preflop_Raised': hand.preflop_raised,
-                    'Preflop_Called': hand.preflop_called,
-                    'VPIP': hand.vpip,
-                    'Three_Bet': hand.three_bet,
-                    'Four_Bet': hand.four_bet,
-                    'Three_Bet_Opportunity': hand.three_bet_opportunity,
-                    'Four_Bet_Opportunity': hand.four_bet_opportunity,
-                    'Pot_Type': hand.pot_type,
-                    'CBet_Flop': hand.cbet_flop,
-                    'CBet_Turn': hand.cbet_turn,
-                    'CBet_River': hand.cbet_river,
-                    'CBet_Flop_Opportunity': hand.cbet_flop_opportunity,
-                    'CBet_Turn_Opportunity': hand.cbet_turn_opportunity,
-                    'CBet_River_Opportunity': hand.cbet_river_opportunity,
-                    'Raw_Text': hand.raw_text
-                })
-            
-            self.df = pd.DataFrame(data)
-            self.df = self.df.sort_values('Timestamp')
-            
-            # Add running totals
-            self.df['Running_Profit'] = self.df['Net_Profit'].cumsum()
-            self.df['Running_Profit_Before_Rake'] = self.df['Net_Profit_Before_Rake'].cumsum()
-            self.df['Running_Rake'] = self.df['Rake_Amount'].cumsum()
-            self.df['Hand_Number'] = range(1, len(self.df) + 1)
-            
+            self.df = df
+            self.raw_texts = raw_texts
+            self.frame_key = source_key(upload_key)
+            self._finalize_frame()
             return True
 
     
@@ -261,106 +663,7 @@ class HeroDataAnalyzer:
         if self.df is None or self.df.empty:
             return {}
         
-        total_hands = len(self.df)
-        total_profit = self.df['Net_Profit'].sum()
-        total_profit_before_rake = self.df['Net_Profit_Before_Rake'].sum()
-        total_rake = self.df['Rake_Amount'].sum()
-        avg_profit = self.df['Net_Profit'].mean()
-        avg_profit_before_rake = self.df['Net_Profit_Before_Rake'].mean()
-        avg_rake = self.df['Rake_Amount'].mean()
-        total_pot_size = self.df['Total_Pot_Size'].sum()
-        rake_percentage = (total_rake / total_pot_size * 100) if total_pot_size > 0 else 0
-        
-        # VPIP metrics (separate from PFR)
-        vpip_hands = self.df['VPIP'].sum()
-        vpip_rate = (vpip_hands / total_hands) * 100 if total_hands > 0 else 0
-        
-        # Flop metrics
-        saw_flop = self.df['Saw_Flop'].sum()
-        flop_rate = (saw_flop / total_hands) * 100 if total_hands > 0 else 0
-        
-        won_when_saw_flop = self.df['Won_When_Saw_Flop'].sum()
-        flop_win_rate = (won_when_saw_flop / saw_flop) * 100 if saw_flop > 0 else 0
-        
-        # Showdown metrics (only calculated on hands where Hero saw flop)
-        went_to_showdown = self.df['Went_to_Showdown'].sum()
-        showdown_rate = (went_to_showdown / saw_flop) * 100 if saw_flop > 0 else 0
-        
-        # Won at showdown (W$SD) - percentage of showdowns won
-        won_at_showdown = self.df['Won_at_Showdown'].sum()
-        won_at_showdown_rate = (won_at_showdown / went_to_showdown) * 100 if went_to_showdown > 0 else 0
-        
-        # Preflop metrics
-        preflop_raised = self.df['Preflop_Raised'].sum()
-        preflop_raise_rate = (preflop_raised / total_hands) * 100 if total_hands > 0 else 0
-        
-        preflop_called = self.df['Preflop_Called'].sum()
-        preflop_call_rate = (preflop_called / total_hands) * 100 if total_hands > 0 else 0
-        
-        # 3-bet metrics
-        three_bet = self.df['Three_Bet'].sum()
-        three_bet_opportunities = self.df['Three_Bet_Opportunity'].sum()
-        three_bet_rate = (three_bet / three_bet_opportunities * 100) if three_bet_opportunities > 0 else 0
-        
-        # 4-bet metrics
-        four_bet = self.df['Four_Bet'].sum()
-        four_bet_opportunities = self.df['Four_Bet_Opportunity'].sum()
-        four_bet_rate = (four_bet / four_bet_opportunities * 100) if four_bet_opportunities > 0 else 0
-        
-        # C-bet metrics
-        cbet_flop = self.df['CBet_Flop'].sum()
-        cbet_turn = self.df['CBet_Turn'].sum()
-        cbet_river = self.df['CBet_River'].sum()
-        
-        # C-bet opportunities
-        cbet_flop_opportunities = self.df['CBet_Flop_Opportunity'].sum()
-        cbet_turn_opportunities = self.df['CBet_Turn_Opportunity'].sum()
-        cbet_river_opportunities = self.df['CBet_River_Opportunity'].sum()
-        
-        # C-bet rates (as percentage of opportunities)
-        cbet_flop_rate = (cbet_flop / cbet_flop_opportunities * 100) if cbet_flop_opportunities > 0 else 0
-        cbet_turn_rate = (cbet_turn / cbet_turn_opportunities * 100) if cbet_turn_opportunities > 0 else 0
-        cbet_river_rate = (cbet_river / cbet_river_opportunities * 100) if cbet_river_opportunities > 0 else 0
-        
-        return {
-            'total_hands': total_hands,
-            'total_profit': total_profit,
-            'total_profit_before_rake': total_profit_before_rake,
-            'total_rake': total_rake,
-            'avg_profit': avg_profit,
-            'avg_profit_before_rake': avg_profit_before_rake,
-            'avg_rake': avg_rake,
-            'rake_percentage': rake_percentage,
-            'vpip_hands': vpip_hands,
-            'vpip_rate': vpip_rate,
-            'went_to_showdown': went_to_showdown,
-            'showdown_rate': showdown_rate,
-            'saw_flop': saw_flop,
-            'flop_rate': flop_rate,
-            'won_when_saw_flop': won_when_saw_flop,
-            'flop_win_rate': flop_win_rate,
-            'won_at_showdown': won_at_showdown,
-            'won_at_showdown_rate': won_at_showdown_rate,
-            'preflop_raised': preflop_raised,
-            'preflop_raise_rate': preflop_raise_rate,
-            'preflop_called': preflop_called,
-            'preflop_call_rate': preflop_call_rate,
-            'three_bet': three_bet,
-            'three_bet_opportunities': three_bet_opportunities,
-            'three_bet_rate': three_bet_rate,
-            'four_bet': four_bet,
-            'four_bet_opportunities': four_bet_opportunities,
-            'four_bet_rate': four_bet_rate,
-            'cbet_flop': cbet_flop,
-            'cbet_turn': cbet_turn,
-            'cbet_river': cbet_river,
-            'cbet_flop_opportunities': cbet_flop_opportunities,
-            'cbet_turn_opportunities': cbet_turn_opportunities,
-            'cbet_river_opportunities': cbet_river_opportunities,
-            'cbet_flop_rate': cbet_flop_rate,
-            'cbet_turn_rate': cbet_turn_rate,
-            'cbet_river_rate': cbet_river_rate
-        }
+        return _key_metrics(self.df, self.frame_key)
     
     def render_overview_metrics(self, metrics):
         """Render overview metrics organized by category"""
@@ -442,6 +745,7 @@ class HeroDataAnalyzer:
                 st.metric("C-Bet River Rate", f"{metrics['cbet_river_rate']:.1f}%")
     
     
+    @st.fragment
     def render_showdown_analysis_chart(self):
         """Render showdown vs non-showdown winnings analysis with position and stakes filters"""
         if self.df is None or self.df.empty:
@@ -450,30 +754,30 @@ class HeroDataAnalyzer:
         # Filters
         col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
         with col1:
-            positions = ['All Positions'] + sorted(list(self.df['Position'].unique()))
+            positions = ['All Positions'] + self._positions
             selected_position = st.selectbox("Filter by Position:", positions, key="results_position_filter")
         
         with col2:
-            stakes = ['All Stakes'] + sorted(list(self.df['Stakes'].unique()))
+            stakes = ['All Stakes'] + self._stakes
             selected_stakes = st.selectbox("Filter by Stakes:", stakes, key="results_stakes_filter")
         
         with col3:
-            # Define pot types in logical order
-            pot_type_order = ['All Pot Types', 'Preflop Only', 'Limped Pot', 'SRP', '3-Bet Pot', '4-Bet Pot', '5+ Bet Pot']
-            available_pot_types = ['All Pot Types'] + [pt for pt in pot_type_order[1:] if pt in self.df['Pot_Type'].unique()]
+            available_pot_types = ['All Pot Types'] + self._available_pot_types
             selected_pot_type = st.selectbox("Filter by Pot Type:", available_pot_types, key="results_pot_type_filter")
         
         # Filter data by position, stakes, and pot type
-        filtered_df = self.df.copy()
+        mask = np.ones(len(self.df), dtype=bool)
         
         if selected_position != 'All Positions':
-            filtered_df = filtered_df[filtered_df['Position'] == selected_position]
+            mask &= equals_mask(self.df['Position'], selected_position)
         
         if selected_stakes != 'All Stakes':
-            filtered_df = filtered_df[filtered_df['Stakes'] == selected_stakes]
+            mask &= equals_mask(self.df['Stakes'], selected_stakes)
         
         if selected_pot_type != 'All Pot Types':
-            filtered_df = filtered_df[filtered_df['Pot_Type'] == selected_pot_type]
+            mask &= equals_mask(self.df['Pot_Type'], selected_pot_type)
+        
+        filtered_df = self.df.loc[mask]
         
         if filtered_df.empty:
             filter_desc = []
@@ -486,32 +790,31 @@ class HeroDataAnalyzer:
             st.warning(f"No data available for {', '.join(filter_desc)}")
             return
         
-        # Calculate showdown vs non-showdown winnings
-        filtered_df['Showdown_Profit'] = 0.0
-        filtered_df['Non_Showdown_Profit'] = 0.0
+        # Calculate showdown vs non-showdown winnings: any hand that went to
+        # showdown (win or lose) counts as showdown, everything else as non-showdown
+        sd = filtered_df['Went_to_Showdown'].to_numpy(dtype=bool)
+        net = filtered_df['Net_Profit'].to_numpy()
+        sd_profit = np.where(sd, net, 0.0)
+        nonsd_profit = np.where(sd, 0.0, net)
+        hand_numbers = filtered_df['Hand_Number'].to_numpy()
         
-        # For each hand, categorize profit based on showdown status
-        for idx, row in filtered_df.iterrows():
-            if row['Went_to_Showdown']:
-                # Any hand that went to showdown (win or lose) goes to showdown category
-                filtered_df.at[idx, 'Showdown_Profit'] = row['Net_Profit']
-            else:
-                # No showdown - all profit goes to non-showdown
-                filtered_df.at[idx, 'Non_Showdown_Profit'] = row['Net_Profit']
+        # Calculate cumulative values on plain arrays, accumulating in float64
+        run_sd = np.cumsum(sd_profit, dtype=np.float64)
+        run_nonsd = np.cumsum(nonsd_profit, dtype=np.float64)
+        run_tot = np.cumsum(net, dtype=np.float64)
         
-        # Calculate cumulative values
-        filtered_df['Running_Showdown_Profit'] = filtered_df['Showdown_Profit'].cumsum()
-        filtered_df['Running_Non_Showdown_Profit'] = filtered_df['Non_Showdown_Profit'].cumsum()
-        filtered_df['Running_Total_Profit'] = filtered_df['Net_Profit'].cumsum()
+        # Thin the running totals to at most MAX_CHART_POINTS before plotting
+        idx = chart_indices(len(hand_numbers), MAX_CHART_POINTS)
+        hand_numbers = hand_numbers[idx]
         
         # Create the chart
         fig = go.Figure()
         
         # Add non-showdown winnings (red line)
         fig.add_trace(
-            go.Scatter(
-                x=filtered_df['Hand_Number'], 
-                y=filtered_df['Running_Non_Showdown_Profit'],
+            go.Scattergl(
+                x=hand_numbers, 
+                y=run_nonsd[idx],
                 name='Non-Showdown Winnings',
                 line=dict(color='red', width=2),
                 hovertemplate='Hand %{x}<br>Non-Showdown: $%{y:.2f}<extra></extra>'
@@ -520,9 +823,9 @@ class HeroDataAnalyzer:
         
         # Add showdown winnings (blue line)
         fig.add_trace(
-            go.Scatter(
-                x=filtered_df['Hand_Number'], 
-                y=filtered_df['Running_Showdown_Profit'],
+            go.Scattergl(
+                x=hand_numbers, 
+                y=run_sd[idx],
                 name='Multiway Showdown Winnings',
                 line=dict(color='blue', width=2),
                 hovertemplate='Hand %{x}<br>Showdown: $%{y:.2f}<extra></extra>'
@@ -531,9 +834,9 @@ class HeroDataAnalyzer:
         
         # Add cumulative profit (green line)
         fig.add_trace(
-            go.Scatter(
-                x=filtered_df['Hand_Number'], 
-                y=filtered_df['Running_Total_Profit'],
+            go.Scattergl(
+                x=hand_numbers, 
+                y=run_tot[idx],
                 name='Cumulative Total Profit',
                 line=dict(color='green', width=3),
                 hovertemplate='Hand %{x}<br>Total: $%{y:.2f}<extra></extra>'
@@ -565,10 +868,10 @@ class HeroDataAnalyzer:
         st.plotly_chart(fig, use_container_width=True)
         
         # Add summary statistics
-        total_showdown_profit = filtered_df['Showdown_Profit'].sum()
-        total_non_showdown_profit = filtered_df['Non_Showdown_Profit'].sum()
-        showdown_hands = (filtered_df['Showdown_Profit'] != 0).sum()
-        non_showdown_hands = (filtered_df['Non_Showdown_Profit'] != 0).sum()
+        total_showdown_profit = sd_profit.sum(dtype=np.float64)
+        total_non_showdown_profit = nonsd_profit.sum(dtype=np.float64)
+        showdown_hands = np.count_nonzero(sd_profit)
+        non_showdown_hands = np.count_nonzero(nonsd_profit)
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -585,18 +888,7 @@ class HeroDataAnalyzer:
         if self.df is None or self.df.empty:
             return
         
-        position_stats = self.df.groupby('Position').agg({
-            'Net_Profit': ['count', 'sum', 'mean'],
-            'Went_to_Showdown': 'mean',
-            'Won_When_Saw_Flop': 'mean',
-            'Preflop_Raised': 'mean',
-            'CBet_Flop': 'mean'
-        }).round(3)
-        
-        position_stats.columns = [
-            'Hands', 'Total_Profit', 'Avg_Profit', 
-            'Showdown_Rate', 'Flop_Win_Rate', 'Preflop_Raise_Rate', 'CBet_Rate'
-        ]
+        position_stats = _position_stats(self.df, self.frame_key)
         
         st.subheader("Position Analysis")
         st.dataframe(position_stats, use_container_width=True)
@@ -606,94 +898,23 @@ class HeroDataAnalyzer:
         if self.df is None or self.df.empty:
             return
         
-        # Calculate stakes statistics
-        stakes_stats = self.df.groupby('Stakes').agg({
-            'Net_Profit': ['count', 'sum', 'mean'],
-            'Went_to_Showdown': 'mean',
-            'Won_When_Saw_Flop': 'mean'
-        }).round(3)
-        
-        stakes_stats.columns = ['Hands', 'Total_Profit', 'Avg_Profit', 'Showdown_Rate', 'Flop_Win_Rate']
-        stakes_stats = stakes_stats.reset_index()
+        fig_cash, fig_bb, display_stats = _stakes_figures(self.df, self.frame_key)
         
-        # Extract big blind value from stakes string (e.g., "$0.02/$0.05" -> 0.05)
-        def extract_bb(stakes_str):
-            try:
-                # Remove dollar signs and split on forward slash
-                parts = stakes_str.replace('$', '').split('/')
-                if len(parts) >= 2:
-                    return float(parts[1].strip())
-                return 1.0  # Default if parsing fails
-            except:
-                return 1.0
-        
-        stakes_stats['BB'] = stakes_stats['Stakes'].apply(extract_bb)
-        stakes_stats['Profit_BB'] = stakes_stats['Total_Profit'] / stakes_stats['BB']
-        
-        # Create two bar charts side by side
+        # Two bar charts side by side
         col1, col2 = st.columns(2)
         
         with col1:
-            # Cash profit bar chart
-            fig_cash = px.bar(
-                stakes_stats,
-                x='Stakes',
-                y='Total_Profit',
-                title='Profit by Stakes ($)',
-                labels={'Stakes': 'Stakes Level', 'Total_Profit': 'Total Profit ($)'},
-                color='Total_Profit',
-                color_continuous_scale=['red', 'yellow', 'green'],
-                text='Total_Profit'
-            )
-            
-            fig_cash.update_traces(texttemplate='$%{text:.2f}', textposition='outside')
-            fig_cash.update_layout(
-                xaxis_title="Stakes Level",
-                yaxis_title="Total Profit ($)",
-                showlegend=False,
-                height=400
-            )
-            
-            # Add zero line
-            fig_cash.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-            
             st.plotly_chart(fig_cash, use_container_width=True)
         
         with col2:
-            # BB profit bar chart
-            fig_bb = px.bar(
-                stakes_stats,
-                x='Stakes',
-                y='Profit_BB',
-                title='Profit by Stakes (BB)',
-                labels={'Stakes': 'Stakes Level', 'Profit_BB': 'Total Profit (BB)'},
-                color='Profit_BB',
-                color_continuous_scale=['red', 'yellow', 'green'],
-                text='Profit_BB'
-            )
-            
-            fig_bb.update_traces(texttemplate='%{text:.1f} BB', textposition='outside')
-            fig_bb.update_layout(
-                xaxis_title="Stakes Level",
-                yaxis_title="Total Profit (BB)",
-                showlegend=False,
-                height=400
-            )
-            
-            # Add zero line
-            fig_bb.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-            
             st.plotly_chart(fig_bb, use_container_width=True)
         
         # Display summary table below charts
         st.subheader("Stakes Summary")
-        display_stats = stakes_stats[['Stakes', 'Hands', 'Total_Profit', 'Profit_BB', 'Avg_Profit']].copy()
-        display_stats['Total_Profit'] = display_stats['Total_Profit'].apply(lambda x: f"${x:.2f}")
-        display_stats['Profit_BB'] = display_stats['Profit_BB'].apply(lambda x: f"{x:.1f} BB")
-        display_stats['Avg_Profit'] = display_stats['Avg_Profit'].apply(lambda x: f"${x:.3f}")
         st.dataframe(display_stats, use_container_width=True, hide_index=True)
     
     
+    @st.fragment
     def render_detailed_data(self):
         """Render detailed hand data with advanced filters and export options"""
         if self.df is None or self.df.empty:
@@ -707,15 +928,15 @@ class HeroDataAnalyzer:
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                positions = ['All'] + sorted(list(self.df['Position'].unique()))
+                positions = ['All'] + self._positions
                 selected_position = st.selectbox("Position", positions, key="detail_position")
             
             with col2:
-                stakes = ['All'] + sorted(list(self.df['Stakes'].unique()))
+                stakes = ['All'] + self._stakes
                 selected_stakes = st.selectbox("Stakes", stakes, key="detail_stakes")
             
             with col3:
-                pot_types = ['All'] + sorted(list(self.df['Pot_Type'].unique()))
+                pot_types = ['All'] + self._pot_types
                 selected_pot_type = st.selectbox("Pot Type", pot_types, key="detail_pot_type")
             
             with col4:
@@ -770,91 +991,25 @@ class HeroDataAnalyzer:
             if 'Timestamp' in self.df.columns and not self.df['Timestamp'].isna().all():
                 col1, col2 = st.columns(2)
                 with col1:
-                    min_date = pd.to_datetime(self.df['Timestamp']).min().date()
-                    max_date = pd.to_datetime(self.df['Timestamp']).max().date()
+                    min_date = self.df['Timestamp'].min().date()
+                    max_date = self.df['Timestamp'].max().date()
                     start_date = st.date_input("From Date", min_date, min_value=min_date, max_value=max_date, key="start_date")
                 
                 with col2:
                     end_date = st.date_input("To Date", max_date, min_value=min_date, max_value=max_date, key="end_date")
         
-        # Apply filters
-        filtered_df = self.df.copy()
-        
-        # Basic filters
-        if selected_position != 'All':
-            filtered_df = filtered_df[filtered_df['Position'] == selected_position]
-        
-        if selected_stakes != 'All':
-            filtered_df = filtered_df[filtered_df['Stakes'] == selected_stakes]
-        
-        if selected_pot_type != 'All':
-            filtered_df = filtered_df[filtered_df['Pot_Type'] == selected_pot_type]
-        
-        # Hole cards filter
-        if hole_cards_filter:
-            hole_cards_upper = hole_cards_filter.upper().strip()
-            filtered_df = filtered_df[filtered_df['Hole_Cards'].str.contains(hole_cards_upper, na=False, regex=False)]
-        
-        # Profit range filter
-        filtered_df = filtered_df[
-            (filtered_df['Net_Profit'] >= profit_range[0]) & 
-            (filtered_df['Net_Profit'] <= profit_range[1])
-        ]
-        
-        # Result filter
-        if result_filter == "Winners Only":
-            filtered_df = filtered_df[filtered_df['Net_Profit'] > 0]
-        elif result_filter == "Losers Only":
-            filtered_df = filtered_df[filtered_df['Net_Profit'] < 0]
-        elif result_filter == "Breakeven":
-            filtered_df = filtered_df[filtered_df['Net_Profit'] == 0]
-        
-        # Flop filter
-        if flop_filter == "Saw Flop":
-            filtered_df = filtered_df[filtered_df['Saw_Flop'] == True]
-        elif flop_filter == "Didn't See Flop":
-            filtered_df = filtered_df[filtered_df['Saw_Flop'] == False]
-        
-        # Showdown filter
-        if showdown_filter == "Went to Showdown":
-            filtered_df = filtered_df[filtered_df['Went_to_Showdown'] == True]
-        elif showdown_filter == "No Showdown":
-            filtered_df = filtered_df[filtered_df['Went_to_Showdown'] == False]
-        
-        # VPIP filter
-        if vpip_filter == "VPIP Only":
-            filtered_df = filtered_df[filtered_df['VPIP'] == True]
-        elif vpip_filter == "Folded Preflop":
-            filtered_df = filtered_df[filtered_df['VPIP'] == False]
-        
-        # Preflop action filter
-        if preflop_action == "Raised":
-            filtered_df = filtered_df[filtered_df['Preflop_Raised'] == True]
-        elif preflop_action == "Called":
-            filtered_df = filtered_df[filtered_df['Preflop_Called'] == True]
-        elif preflop_action == "Folded":
-            filtered_df = filtered_df[(filtered_df['Preflop_Raised'] == False) & 
-                                     (filtered_df['Preflop_Called'] == False)]
-        
-        # 3-Bet filter
-        if three_bet_filter == "3-Bet":
-            filtered_df = filtered_df[filtered_df['Three_Bet'] == True]
-        elif three_bet_filter == "No 3-Bet":
-            filtered_df = filtered_df[filtered_df['Three_Bet'] == False]
-        
-        # C-Bet filter
-        if cbet_filter == "C-Bet Flop":
-            filtered_df = filtered_df[filtered_df['CBet_Flop'] == True]
-        elif cbet_filter == "No C-Bet":
-            filtered_df = filtered_df[filtered_df['CBet_Flop'] == False]
-        
-        # Date range filter
-        if 'Timestamp' in filtered_df.columns and not filtered_df['Timestamp'].isna().all():
-            filtered_df['Date'] = pd.to_datetime(filtered_df['Timestamp']).dt.date
-            filtered_df = filtered_df[
-                (filtered_df['Date'] >= start_date) & 
-                (filtered_df['Date'] <= end_date)
-            ]
+        # Apply filters, memoized per filter selection; full-span ranges are dropped as no-ops
+        profit_bounds = None if tuple(profit_range) == (min_profit, max_profit) else tuple(profit_range)
+        date_range = None
+        if 'Timestamp' in self.df.columns and not self.df['Timestamp'].isna().all():
+            if start_date > min_date or end_date < max_date:
+                date_range = (start_date, end_date)
+        filters = (
+            selected_position, selected_stakes, selected_pot_type, hole_cards_filter, profit_bounds,
+            result_filter, flop_filter, showdown_filter, vpip_filter, preflop_action,
+            three_bet_filter, cbet_filter, date_range
+        )
+        filtered_df = self.df.iloc[_filter_positions(self.df, self.frame_key, filters)]
         
         # Display filter results summary
         st.info(f"📊 Showing {len(filtered_df):,} of {len(self.df):,} hands")
@@ -864,10 +1019,10 @@ class HeroDataAnalyzer:
         
         with col1:
             if not filtered_df.empty:
-                csv_data = filtered_df.to_csv(index=False)
+                # Serialized only when the button is clicked
                 st.download_button(
                     label="📥 Download Analysis Data (CSV)",
-                    data=csv_data,
+                    data=lambda: _filtered_csv(self.df, self.frame_key, filters),
                     file_name=f"filtered_hands_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv",
                     key="download_filtered_csv",
@@ -877,11 +1032,11 @@ class HeroDataAnalyzer:
         with col2:
             if not filtered_df.empty:
                 # Export all raw hand histories
-                if 'Raw_Text' in filtered_df.columns:
-                    all_raw_hands = '\n\n'.join(filtered_df['Raw_Text'].tolist())
+                if self._has_raw_text():
+                    labels = filtered_df.index
                     st.download_button(
                         label="📋 Export Raw Hand Histories (TXT)",
-                        data=all_raw_hands,
+                        data=lambda: self._raw_hand_export(labels),
                         file_name=f"hand_histories_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
                         mime="text/plain",
                         key="download_all_raw_hands",
@@ -897,24 +1052,20 @@ class HeroDataAnalyzer:
         
         # Display data with enhanced columns
         if not filtered_df.empty:
-            # Create a display dataframe with formatted values
-            display_df = filtered_df[['Hand_ID', 'Timestamp', 'Position', 'Stakes', 'Hole_Cards', 
-                                     'Net_Profit', 'Total_Pot_Size', 'Pot_Type', 'VPIP',
-                                     'Saw_Flop', 'Went_to_Showdown', 'Won_When_Saw_Flop',
-                                     'Preflop_Raised', 'Three_Bet', 'Four_Bet', 'CBet_Flop']].copy()
-            
-            # Format numeric columns
-            display_df['Net_Profit'] = display_df['Net_Profit'].apply(lambda x: f"${x:.2f}")
-            display_df['Total_Pot_Size'] = display_df['Total_Pot_Size'].apply(lambda x: f"${x:.2f}")
-            
-            # Sort by timestamp descending (most recent first)
-            display_df = display_df.sort_values('Timestamp', ascending=False)
+            # Project the display columns, most recent first; the frame is already in Timestamp
+            # order, so reversing it replaces a sort. Money columns stay numeric and are
+            # formatted by st.dataframe, so no separate copy is needed
+            display_df = filtered_df[DETAIL_COLUMNS].iloc[::-1]
             
             # Display table
             st.dataframe(
                 display_df,
                 use_container_width=True,
-                height=600
+                height=600,
+                column_config={
+                    'Net_Profit': st.column_config.NumberColumn('Net_Profit', format="$%.2f"),
+                    'Total_Pot_Size': st.column_config.NumberColumn('Total_Pot_Size', format="$%.2f")
+                }
             )
             
             # Individual hand export section with table of download buttons
@@ -930,31 +1081,32 @@ class HeroDataAnalyzer:
                     key="hand_id_search"
                 )
             
+            # Search once; the count and the results below share the matches
+            if search_hand_id:
+                search_results = filtered_df.iloc[
+                    _search_positions(self.df, self.frame_key, filters, search_hand_id)
+                ]
+            
             with col2:
                 st.markdown("<br>", unsafe_allow_html=True)  # Add spacing to align with input
                 if search_hand_id:
-                    # Search for the hand
-                    matching_hands = filtered_df[filtered_df['Hand_ID'].str.contains(search_hand_id, case=False, na=False)]
-                    
-                    if not matching_hands.empty:
-                        st.success(f"✅ Found {len(matching_hands)} matching hand(s)")
+                    if not search_results.empty:
+                        st.success(f"✅ Found {len(search_results)} matching hand(s)")
                     else:
                         st.error("❌ No matching hands found")
             
             # If there's a search, show only matching hands
             if search_hand_id:
-                search_results = filtered_df[filtered_df['Hand_ID'].str.contains(search_hand_id, case=False, na=False)]
-                
                 if not search_results.empty:
                     st.markdown("#### Search Results")
                     
-                    for idx, (_, row) in enumerate(search_results.iterrows()):
-                        hand_id = row['Hand_ID']
-                        hole_cards = row['Hole_Cards']
-                        net_profit = row['Net_Profit']
-                        timestamp = row['Timestamp']
-                        position = row['Position']
-                        stakes = row['Stakes']
+                    for idx, row in enumerate(search_results.itertuples()):
+                        hand_id = row.Hand_ID
+                        hole_cards = row.Hole_Cards
+                        net_profit = row.Net_Profit
+                        timestamp = row.Timestamp
+                        position = row.Position
+                        stakes = row.Stakes
                         profit_emoji = "🟢" if net_profit >= 0 else "🔴"
                         
                         # Create an expander for each matching hand
@@ -971,10 +1123,10 @@ class HeroDataAnalyzer:
                             
                             with col3:
                                 # Download button
-                                if 'Raw_Text' in row and row['Raw_Text']:
+                                if self._has_raw_text():
                                     st.download_button(
                                         label="📥 Download",
-                                        data=row['Raw_Text'],
+                                        data=lambda label=row.Index: self._raw_hand_texts([label])[0],
                                         file_name=f"hand_{hand_id}.txt",
                                         mime="text/plain",
                                         key=f"download_search_{hand_id}_{idx}",
@@ -987,46 +1139,42 @@ class HeroDataAnalyzer:
             
             st.caption("💡 Or browse recent hands below")
             
-            # Limit to showing max 20 hands to avoid too many buttons
+            # Limit to showing max 20 hands
             display_limit = min(20, len(filtered_df))
             if len(filtered_df) > display_limit:
-                st.info(f"📌 Showing export buttons for the first {display_limit} hands (sorted by most recent). Use filters to narrow down specific hands.")
+                st.info(f"📌 Showing the {display_limit} most recent hands. Use filters to narrow down specific hands.")
+            
+            # filtered_df keeps the load's Timestamp order, so the most recent hands are its tail
+            sorted_filtered_df = filtered_df.tail(display_limit).iloc[::-1]
             
-            # Create a grid of export buttons (4 per row)
-            sorted_filtered_df = filtered_df.sort_values('Timestamp', ascending=False).head(display_limit)
+            # One ZIP download for the hands shown, built only when clicked
+            if self._has_raw_text():
+                labels = sorted_filtered_df.index
+                hand_ids = sorted_filtered_df['Hand_ID'].tolist()
+                st.download_button(
+                    label=f"📦 Download these {display_limit} hands (ZIP)",
+                    data=lambda: self._raw_hand_zip(labels, hand_ids),
+                    file_name=f"hands_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                    mime="application/zip",
+                    key="download_recent_hands_zip"
+                )
+            
+            # Build every card's text up front so the loop only lays out elements
+            net = sorted_filtered_df['Net_Profit'].to_numpy()
+            grid = sorted_filtered_df[['Hole_Cards']].assign(
+                Caption=np.where(net >= 0, "🟢", "🔴") + sorted_filtered_df['Net_Profit'].map(" ${:.2f}".format),
+                Label=sorted_filtered_df['Hand_ID'].str.slice(0, 8) + "..."
+            )
             
-            for idx, (_, row) in enumerate(sorted_filtered_df.iterrows()):
+            # Grid of recent hands (4 per row)
+            for idx, hand in enumerate(grid.itertuples(index=False)):
                 if idx % 4 == 0:
                     cols = st.columns(4)
                 
-                col_idx = idx % 4
-                with cols[col_idx]:
-                    hand_id = row['Hand_ID']
-                    hole_cards = row['Hole_Cards']
-                    net_profit = row['Net_Profit']
-                    profit_emoji = "🟢" if net_profit >= 0 else "🔴"
-                    
-                    # Display hand info
-                    st.markdown(f"**{hole_cards}**")
-                    st.caption(f"{profit_emoji} ${net_profit:.2f}")
-                    
-                    # Export button
-                    if 'Raw_Text' in row and row['Raw_Text']:
-                        st.download_button(
-                            label=f"📥 {hand_id[:8]}...",
-                            data=row['Raw_Text'],
-                            file_name=f"hand_{hand_id}.txt",
-                            mime="text/plain",
-                            key=f"download_hand_{hand_id}_{idx}",
-                            use_container_width=True
-                        )
-                    else:
-                        st.button(
-                            "❌ N/A",
-                            disabled=True,
-                            use_container_width=True,
-                            key=f"no_data_{hand_id}_{idx}"
-                        )
+                with cols[idx % 4]:
+                    st.markdown(f"**{hand.Hole_Cards}**")
+                    st.caption(hand.Caption)
+                    st.caption(hand.Label)
         else:
             st.warning("No hands match the current filters. Try adjusting your filter criteria.")
     
@@ -1126,8 +1274,7 @@ def main():
             # Show folder info if path exists
             if os.path.exists(folder_path):
                 try:
-                    file_pattern = os.path.join(folder_path, '**', '*.txt')
-                    all_files = glob.glob(file_pattern, recursive=True)
+                    all_files = find_txt_files(folder_path)
                     if all_files:
                         st.success(f"✅ Found {len(all_files)} .txt file(s) in this folder")
                     else:
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared frame helpers and main.py's filter and category aggregation,
+checked against plain pandas equivalents
+"""
+
+import glob
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hero_analysis_helpers import chart_indices, equals_mask, POSITION_RATE_COLUMNS
+from hero_analysis_parser import parse_one_file
+import main
+
+ALL_FILTERS = ('All', 'All', 'All', '', None, 'All', 'All', 'All', 'All', 'All', 'All', 'All', None)
+
+
+@pytest.fixture(scope="module")
+def hands():
+    """A few sample files loaded the way main.py loads them"""
+    frames = [parse_one_file(path) for path in sorted(glob.glob("SPE/*.txt"))[:3]]
+    df = pd.concat(frames, ignore_index=True).drop(columns='Raw_Text')
+    df = df.sort_values('Timestamp', kind='stable', ignore_index=True)
+    return main._compact_dtypes(df)
+
+
+def _filters(**changes):
+    names = ['position', 'stakes', 'pot_type', 'hole_cards', 'profit_range', 'result', 'flop',
+             'showdown', 'vpip', 'preflop', 'three_bet', 'cbet', 'date_range']
+    filters = dict(zip(names, ALL_FILTERS))
+    filters.update(changes)
+    return tuple(filters[name] for name in names)
+
+
+def test_equals_mask_categorical():
+    col = pd.Series(['BTN', 'SB', 'BTN', None], dtype='category')
+    assert equals_mask(col, 'BTN').tolist() == [True, False, True, False]
+    assert equals_mask(col, 'UTG').tolist() == [False, False, False, False]
+
+
+def test_equals_mask_plain_column():
+    col = pd.Series(['BTN', 'SB', 'BTN'])
+    assert equals_mask(col, 'SB').tolist() == [False, True, False]
+
+
+def test_chart_indices_short_series_keeps_every_point():
+    assert chart_indices(7, 10).tolist() == list(range(7))
+
+
+def test_chart_indices_long_series_is_capped_and_keeps_last():
+    idx = chart_indices(10_001, 1_000)
+    assert idx[0] == 0 and idx[-1] == 10_000
+    assert len(idx) <= 1_001
+    assert (np.diff(idx) > 0).all()
+
+
+@pytest.mark.parametrize("changes, expected", [
+    ({}, lambda df: np.ones(len(df), dtype=bool)),
+    ({'position': 'Button'}, lambda df: df['Position'] == 'Button'),
+    ({'pot_type': 'SRP', 'showdown': 'Went to Showdown'},
+     lambda df: (df['Pot_Type'] == 'SRP') & df['Went_to_Showdown']),
+    ({'profit_range': (-1.0, 1.0), 'result': 'Winners Only'},
+     lambda df: df['Net_Profit'].between(-1.0, 1.0) & (df['Net_Profit'] > 0)),
+    ({'hole_cards': 'a', 'preflop': 'Folded'},
+     lambda df: df['Hole_Cards'].str.contains('A', regex=False) & ~(df['Preflop_Raised'] | df['Preflop_Called'])),
+    ({'vpip': 'VPIP Only', 'flop': "Didn't See Flop", 'three_bet': 'No 3-Bet'},
+     lambda df: df['VPIP'] & ~df['Saw_Flop'] & ~df['Three_Bet']),
+])
+def test_filter_positions_match_pandas(hands, changes, expected):
+    positions = main._filter_positions(hands, ('test', len(hands)), _filters(**changes))
+    assert positions.tolist() == np.flatnonzero(np.asarray(expected(hands), dtype=bool)).tolist()
+
+
+def test_filter_positions_date_range(hands):
+    day = hands['Timestamp'].iloc[len(hands) // 2].date()
+    positions = main._filter_positions(hands, ('test', len(hands)), _filters(date_range=(day, day)))
+    expected = np.flatnonzero((hands['Timestamp'].dt.date == day).to_numpy())
+    assert positions.tolist() == expected.tolist()
+
+
+def test_category_stats_match_groupby(hands):
+    stats = main._category_stats(hands, 'Position', POSITION_RATE_COLUMNS)
+    columns = ['Net_Profit'] + list(POSITION_RATE_COLUMNS.values())
+    grouped = hands[['Position'] + columns].astype({'Net_Profit': 'float64'}).groupby('Position', observed=True)
+    expected = pd.DataFrame({
+        'Hands': grouped.size(),
+        'Total_Profit': grouped['Net_Profit'].sum(),
+        'Avg_Profit': grouped['Net_Profit'].mean(),
+        **{rate: grouped[col].mean() for rate, col in POSITION_RATE_COLUMNS.items()}
+    }).round(3)
+    assert stats.index.tolist() == expected.index.tolist()
+    pd.testing.assert_frame_equal(stats.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False)
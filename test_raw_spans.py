@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests that hand text read back from file byte spans matches the parsed Raw_Text
+"""
+
+import glob
+
+import pytest
+
+from hero_analysis_parser import parse_one_file, read_raw_spans, join_raw_spans
+
+SAMPLE_FILE = sorted(glob.glob("SPE/*.txt"))[0]
+
+
+def _span_texts(path):
+    df = parse_one_file(path, raw_spans=True)
+    return read_raw_spans(df['Raw_Path'], df['Raw_Start'], df['Raw_End'])
+
+
+@pytest.fixture(scope="module")
+def raw_texts():
+    """Raw_Text of every hand in the sample file, parsed the text way"""
+    return parse_one_file(SAMPLE_FILE)['Raw_Text'].tolist()
+
+
+@pytest.fixture(scope="module")
+def sample_bytes():
+    with open(SAMPLE_FILE, 'rb') as f:
+        return f.read()
+
+
+def test_spans_match_raw_text(raw_texts):
+    texts = _span_texts(SAMPLE_FILE)
+    assert len(texts) == len(raw_texts) > 1
+    assert texts == raw_texts
+    # The last hand runs to the end of the file rather than to the next header
+    assert texts[-1] == raw_texts[-1]
+
+
+def test_spans_match_raw_text_crlf(tmp_path, raw_texts, sample_bytes):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(sample_bytes.replace(b'\r\n', b'\n').replace(b'\n', b'\r\n'))
+    assert _span_texts(str(path)) == raw_texts
+    assert parse_one_file(str(path))['Raw_Text'].tolist() == raw_texts
+
+
+def test_last_hand_without_trailing_newline(tmp_path, raw_texts, sample_bytes):
+    path = tmp_path / "no_newline.txt"
+    path.write_bytes(sample_bytes.rstrip())
+    texts = _span_texts(str(path))
+    assert texts == raw_texts
+    assert texts[-1] == raw_texts[-1]
+
+
+def test_join_raw_spans_matches_joined_text(tmp_path, raw_texts, sample_bytes):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(sample_bytes.replace(b'\r\n', b'\n').replace(b'\n', b'\r\n'))
+    df = parse_one_file(str(path), raw_spans=True)
+    joined = join_raw_spans(df['Raw_Path'], df['Raw_Start'], df['Raw_End'])
+    assert joined == '\n\n'.join(raw_texts).encode('utf-8')